@@ -1,4 +1,52 @@
-from .pyactivetigger import AtApi
-from . import automate
+"""
+Python client for the ActiveTigger API.
+
+The client classes and the automate helpers are imported on first access,
+so `import atclient` stays cheap for scripts that only need part of it.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.0"
+
+# public name -> (submodule, attribute or None for the submodule itself)
+_LAZY = {
+    "AtApi": (".pyactivetigger", "AtApi"),
+    "AsyncAtApi": (".asyncapi", "AsyncAtApi"),
+    "automate": (".automate", None),
+    "DatasetValidationError": (".validation", "DatasetValidationError"),
+    "PoolTimeout": (".session", "PoolTimeout"),
+    "validate_dataset": (".validation", "validate_dataset"),
+}
+
+__all__ = [
+    "AtApi",
+    "AsyncAtApi",
+    "DatasetValidationError",
+    "PoolTimeout",
+    "automate",
+    "validate_dataset",
+    "__version__",
+]
+
+if TYPE_CHECKING:
+    from . import automate
+    from .asyncapi import AsyncAtApi
+    from .pyactivetigger import AtApi
+    from .session import PoolTimeout
+    from .validation import DatasetValidationError, validate_dataset
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
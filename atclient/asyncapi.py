@@ -0,0 +1,942 @@
+"""
+Asyncio client for the ActiveTigger API.
+
+AsyncAtApi mirrors the methods of AtApi as coroutines. All calls share one
+aiohttp connection pool and a semaphore bounding the number of requests in
+flight, so thousands of calls can be scheduled on a single event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, List
+
+import aiohttp  # type: ignore[import]
+
+from .cache import TTLCache
+from .lazy import lazy_import
+from .pyactivetigger import (
+    ANNOTATION_DTYPES,
+    check_columns,
+    check_return_type,
+    count_rows,
+    parse_error_message,
+    read_csv_as,
+    schemes_from_state,
+)
+from .session import DEFAULT_HEADERS, DEFAULT_TIMEOUTS
+from .upload import estimate_payload, format_size, minimize_frame
+from .validation import check_dataset
+
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore[import]
+    import yaml  # type: ignore[import]
+else:
+    pd = lazy_import("pandas")
+    yaml = lazy_import("yaml")
+
+
+class AsyncResponse:
+    """
+    Fully read response, released from the pool before being returned
+    """
+
+    def __init__(self, status: int, content: bytes, headers: dict):
+        self.status_code = status
+        self.content = content
+        self.headers = headers
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _query(params: dict | None) -> list[tuple[str, str]] | None:
+    """
+    Encode params like requests does: lists as repeated keys, no None
+    """
+    if params is None:
+        return None
+    query = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for v in values:
+            if v is None:
+                continue
+            if isinstance(v, bool):
+                v = str(v).lower()
+            query.append((key, str(v)))
+    return query
+
+
+def _timeout(value: float | tuple[float, float]) -> aiohttp.ClientTimeout:
+    if isinstance(value, tuple):
+        return aiohttp.ClientTimeout(sock_connect=value[0], sock_read=value[1])
+    return aiohttp.ClientTimeout(total=value)
+
+
+class AsyncAtApi:
+    def __init__(
+        self,
+        url: str | None = None,
+        config: str | None = None,
+        max_concurrency: int = 100,
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 0,
+        timeouts: dict | None = None,
+        headers: dict[str, str] | None = None,
+        cache_ttl: float = 2.0,
+        cache_size: int = 256,
+    ):
+        """
+        Initialize the client
+
+        The connection is opened on first use; credentials found in the
+        config file are used when entering `async with`.
+
+        Args:
+            url: url of the API (ignored if config is provided)
+            config: path to a YAML config file with url/username/password
+            max_concurrency: maximum number of requests in flight
+            pool_limit: maximum number of open connections
+            pool_limit_per_host: maximum number of connections per host (0 = no limit)
+            timeouts: per-endpoint timeouts, merged over DEFAULT_TIMEOUTS
+            headers: default headers sent with every request
+            cache_ttl: seconds project states and the project list are cached (0 to disable)
+            cache_size: maximum number of cached entries
+        """
+        self.headers: dict[str, str] | None = None
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.default_headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.cache = TTLCache(ttl=cache_ttl, maxsize=cache_size)
+        self.max_concurrency = max_concurrency
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self._credentials: tuple[str, str] | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        if config:
+            if not Path(config).is_file():
+                raise Exception("Config file does not exist")
+            with open(Path(config), "r") as stream:
+                config_data = yaml.load(stream, Loader=yaml.FullLoader)
+            if "url" not in config_data:
+                raise Exception("Url not found in config file")
+            self.url = config_data.get("url")
+            if "username" in config_data and "password" in config_data:
+                self._credentials = (
+                    config_data.get("username"),
+                    config_data.get("password"),
+                )
+        else:
+            if not url:
+                raise Exception("Url not provided")
+            self.url = url
+
+    async def __aenter__(self):
+        if self._credentials and not self.headers:
+            await self.connect(*self._credentials)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close the connection pool
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        # bound to the event loop of the session, a new one comes with the next
+        self._semaphore = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_limit_per_host,
+                ssl=False,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers=self.default_headers
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _prepare(
+        self, endpoint: str, path_params: dict | None, auth: bool, kwargs: dict
+    ) -> str:
+        if auth:
+            if not self.headers:
+                raise Exception("No token found")
+            kwargs["headers"] = {**self.headers, **kwargs.get("headers", {})}
+        kwargs["timeout"] = _timeout(
+            kwargs.pop("timeout", None)
+            or self.timeouts.get(endpoint, self.timeouts["default"])
+        )
+        if "params" in kwargs:
+            kwargs["params"] = _query(kwargs["params"])
+        path = endpoint.format(**path_params) if path_params else endpoint
+        return f"{self.url}{path}"
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        path_params: dict | None = None,
+        auth: bool = True,
+        **kwargs,
+    ) -> AsyncResponse:
+        """
+        Send a request to an endpoint template and read the whole response
+        """
+        url = self._prepare(endpoint, path_params, auth, kwargs)
+        session = self._get_session()
+        async with self._semaphore:  # type: ignore[union-attr]
+            async with session.request(method, url, **kwargs) as r:
+                content = await r.read()
+                return AsyncResponse(r.status, content, dict(r.headers))
+
+    def cache_stats(self) -> dict:
+        """
+        Cache statistics: hits, misses, evictions and current size
+        """
+        return self.cache.stats()
+
+    def _parse_error(self, r: AsyncResponse) -> str:
+        """Extract a readable error message from an error response."""
+        return parse_error_message(r.text, r.status_code)
+
+    async def ping(self) -> dict:
+        """
+        Test API availability and measure response time.
+
+        Returns a dict with:
+            - available (bool): whether the API responded successfully
+            - response_time_ms (float | None): round-trip time in milliseconds
+            - status_code (int | None): HTTP status code returned
+            - timestamp (str): ISO timestamp of the check
+        """
+        result = {
+            "available": False,
+            "response_time_ms": None,
+            "status_code": None,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        try:
+            start = time.monotonic()
+            r = await self._request("GET", "/", auth=False)
+            result["response_time_ms"] = round((time.monotonic() - start) * 1000, 2)
+            result["status_code"] = r.status_code
+            result["available"] = r.status_code == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        return result
+
+    async def connect(self, username: str, password: str):
+        """
+        Get token access with username/password
+        """
+        try:
+            r = await self._request(
+                "POST",
+                "/token",
+                auth=False,
+                data={"username": username, "password": password},
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error connecting to endpoint: {e}")
+            return
+        if not r.ok:
+            print(f"Error connecting: {self._parse_error(r)}")
+            return
+        access_token = r.json().get("access_token")
+        if access_token:
+            self.headers = {
+                "Authorization": f"Bearer {access_token}",
+                "username": username,
+            }
+            self.cache.clear()
+            print("Token received")
+        else:
+            print("Error: no access token in response")
+
+    async def get_project_state(self, project_slug: str):
+        """
+        Get project state, cached for cache_ttl seconds
+        """
+        cached = self.cache.get(("state", project_slug))
+        if cached is not None:
+            return cached
+        r = await self._request(
+            "GET",
+            "/projects/{project_slug}",
+            path_params={"project_slug": project_slug},
+        )
+        if not r.ok:
+            raise Exception(f"Error getting project state: {self._parse_error(r)}")
+        state = r.json()
+        self.cache.set(("state", project_slug), state)
+        return state
+
+    async def get_projects(self):
+        """
+        Get projects, cached for cache_ttl seconds
+        """
+        cached = self.cache.get(("projects",))
+        if cached is not None:
+            return cached
+        r = await self._request("GET", "/projects")
+        if not r.ok:
+            raise Exception(f"Error getting projects: {self._parse_error(r)}")
+        projects = r.json()["projects"]
+        self.cache.set(("projects",), projects)
+        return projects
+
+    async def get_projects_slugs(self):
+        """
+        Get projects slugs
+        """
+        projects = await self.get_projects()
+        return [i["parameters"]["project_slug"] for i in projects]
+
+    async def add_project(
+        self,
+        project_name: str,
+        data: pd.DataFrame,
+        col_id: str,
+        cols_text: List[str],
+        cols_context: List[str] = [],
+        cols_label: List[str] = [],
+        n_train: int = 500,
+        n_test: int = 0,
+        n_valid: int = 0,
+        filename: str = "data.csv",
+        language: str = "fr",
+        random_selection: bool = False,
+        n_skip: int = 0,
+        default_scheme: List[str] = [],
+        embeddings: List[str] = [],
+        test: bool = False,
+        valid: bool = False,
+        n_total: int | None = None,
+        clear_test: bool = False,
+        clear_valid: bool = False,
+        cols_stratify: List[str] = [],
+        stratify_train: bool = False,
+        stratify_test: bool = False,
+        force_label: bool = False,
+        force_computation: bool = False,
+        seed: int = 42,
+        from_project: str | None = None,
+        from_toy_dataset: bool = False,
+        validate: bool = True,
+        minimize: bool = True,
+        normalize_whitespace: bool = False,
+    ):
+        """
+        Create a new project
+
+        The dataset is sent as one csv file: unlike AtApi.add_project, there
+        is no parquet format, streamed or compressed upload, progress
+        callback nor dataset registry.
+
+        Args:
+            project_name: name of the project
+            data: data to use as a Pandas DataFrame
+            col_id: column id
+            cols_text: list of text columns
+            cols_context: list of context columns
+            cols_label: list of label columns
+            n_train: number of training samples
+            n_test: number of test samples
+            n_valid: number of validation samples
+            filename: name of the uploaded file
+            language: language of the project
+            random_selection: whether to randomly select samples
+            n_skip: number of samples to skip
+            default_scheme: default annotation scheme labels
+            embeddings: list of embeddings to compute
+            test: whether to create a test split
+            valid: whether to create a validation split
+            n_total: total number of samples (optional)
+            clear_test: whether to clear the existing test set
+            clear_valid: whether to clear the existing validation set
+            cols_stratify: columns to use for stratification
+            stratify_train: whether to stratify the training set
+            stratify_test: whether to stratify the test set
+            force_label: whether to force label assignment
+            force_computation: whether to force recomputation
+            seed: random seed
+            from_project: slug of an existing project to copy data from
+            from_toy_dataset: whether to use a toy dataset
+            validate: check ids, texts, labels and split sizes before the upload,
+                raise DatasetValidationError with the report if an issue is found
+            minimize: upload only the columns above, label and stratify columns
+                as categories, and print the payload size before and after
+            normalize_whitespace: collapse runs of whitespace in the texts (with minimize)
+        """
+        columns = [col_id, *cols_text, *cols_context, *cols_label, *cols_stratify]
+        check_columns(data, columns)
+        if validate:
+            await asyncio.to_thread(
+                check_dataset,
+                data,
+                col_id=col_id,
+                cols_text=cols_text,
+                cols_label=cols_label,
+                n_train=n_train,
+                n_test=n_test,
+                n_valid=n_valid,
+                n_skip=n_skip,
+                n_total=n_total,
+            )
+
+        # send only what the server reads
+        if minimize:
+            size_before = await asyncio.to_thread(estimate_payload, data)
+            data = await asyncio.to_thread(
+                minimize_frame, data, columns, texts=cols_text if normalize_whitespace else []
+            )
+
+        # send the file, serialized outside of the event loop
+        csv_string = await asyncio.to_thread(data.to_csv, index=False)
+        if minimize:
+            size = len(csv_string.encode("utf-8"))
+            saved = 1 - size / size_before if size_before else 0.0
+            print(
+                f"Upload payload: {format_size(size_before)} -> {format_size(size)}"
+                f" ({saved:.0%} smaller)"
+            )
+        form_file = aiohttp.FormData()
+        form_file.add_field("file", csv_string, filename=filename)
+        r = await self._request(
+            "POST",
+            "/files/add/project",
+            params={"project_name": project_name},
+            data=form_file,
+        )
+        if not r.ok:
+            raise Exception(f"Error uploading file: {self._parse_error(r)}")
+
+        # create the project
+        form = {
+            "project_name": project_name,
+            "col_id": col_id,
+            "cols_text": cols_text,
+            "cols_label": cols_label,
+            "filename": filename,
+            "cols_context": cols_context,
+            "language": language,
+            "n_train": n_train,
+            "n_test": n_test,
+            "n_valid": n_valid,
+            "random_selection": random_selection,
+            "n_skip": n_skip,
+            "default_scheme": default_scheme,
+            "embeddings": embeddings,
+            "test": test,
+            "valid": valid,
+            "n_total": n_total,
+            "clear_test": clear_test,
+            "clear_valid": clear_valid,
+            "cols_stratify": cols_stratify,
+            "stratify_train": stratify_train,
+            "stratify_test": stratify_test,
+            "force_label": force_label,
+            "force_computation": force_computation,
+            "seed": seed,
+            "from_project": from_project,
+            "from_toy_dataset": from_toy_dataset,
+        }
+        r = await self._request("POST", "/projects/new", json=form)
+        self.cache.invalidate(("projects",))
+        if not r.ok:
+            raise Exception(f"Error creating project: {self._parse_error(r)}")
+        return r.json()
+
+    async def delete_project(self, project_slug: str):
+        """
+        Delete a project
+        """
+        r = await self._request(
+            "POST", "/projects/delete", params={"project_slug": project_slug}
+        )
+        self.cache.invalidate(("projects",), ("state", project_slug))
+        if not r.ok:
+            print(f"Error deleting project: {self._parse_error(r)}")
+        else:
+            print("Project deleted")
+
+    async def get_users(self):
+        """
+        Get users
+        """
+        r = await self._request("GET", "/users")
+        if not r.ok:
+            raise Exception(f"Error getting users: {self._parse_error(r)}")
+        return r.json()
+
+    async def add_user(
+        self, username: str, password: str, mail: str, status: str = "manager"
+    ):
+        """
+        Create a new user
+        """
+        r = await self._request(
+            "POST",
+            "/users/create",
+            json={
+                "username": username,
+                "password": password,
+                "contact": mail,
+                "status": status,
+            },
+        )
+        if not r.ok:
+            print(f"Error creating user: {self._parse_error(r)}")
+        else:
+            print("User created")
+
+    async def delete_user(self, username: str) -> None:
+        """
+        Delete a user
+        """
+        r = await self._request(
+            "POST", "/users/delete", params={"user_to_delete": username}
+        )
+        if not r.ok:
+            print(f"Error deleting user: {self._parse_error(r)}")
+        else:
+            print("User deleted")
+
+    async def get_annotations_data(
+        self,
+        project_slug: str,
+        scheme: str,
+        dataset: str = "train",
+        verbose: bool = False,
+        return_type: str = "pandas",
+    ):
+        """
+        Get current annotations for a projet/scheme
+
+        return_type: "pandas", "arrow", "records" or "raw" (see AtApi)
+        """
+        check_return_type(return_type)
+        r = await self._request(
+            "GET",
+            "/export/data",
+            params={
+                "project_slug": project_slug,
+                "scheme": scheme,
+                "dataset": dataset,
+                "format": "csv",
+            },
+        )
+        if not r.ok:
+            if verbose:
+                print(f"Error getting annotations: {self._parse_error(r)}")
+            return None
+        try:
+            t = await asyncio.to_thread(
+                read_csv_as, io.BytesIO(r.content), return_type, ANNOTATION_DTYPES
+            )
+            if count_rows(t) == 0:
+                if verbose:
+                    print(f"No {dataset} annotations found for {project_slug}/{scheme}")
+                return None
+            return t
+        except Exception as e:
+            if verbose:
+                print(f"Error parsing annotations: {e}")
+            return None
+
+    async def add_auth_user_project(
+        self, username: str, project_slug: str, auth: str = "manager"
+    ):
+        """
+        Add a user to a project
+        """
+        r = await self._request(
+            "POST",
+            "/users/auth/add",
+            json={"project_slug": project_slug, "username": username, "status": auth},
+        )
+        self.cache.invalidate(("projects",), ("state", project_slug))
+        if not r.ok:
+            print(f"Error adding user auth: {self._parse_error(r)}")
+        else:
+            print("Auth added to user")
+
+    async def delete_auth_user_project(self, username: str, project_slug: str):
+        """
+        Delete a user from a project
+        """
+        r = await self._request(
+            "POST",
+            "/users/auth/delete",
+            json={"project_slug": project_slug, "username": username},
+        )
+        self.cache.invalidate(("projects",), ("state", project_slug))
+        if not r.ok:
+            print(f"Error deleting user auth: {self._parse_error(r)}")
+        else:
+            print("Auth deleted for user")
+
+    async def get_features(self, project_slug: str):
+        """
+        Get features of the project
+        """
+        r = await self._request(
+            "GET", "/features/available", params={"project_slug": project_slug}
+        )
+        if not r.ok:
+            raise Exception(f"Error getting features: {self._parse_error(r)}")
+        return r.json()
+
+    async def add_feature(
+        self,
+        project_slug: str,
+        feature_name: str,
+        feature_type: str,
+        feature_parameters: dict = {},
+    ):
+        """
+        Train a feature
+        """
+        r = await self._request(
+            "POST",
+            "/features/add",
+            params={"project_slug": project_slug},
+            json={
+                "name": feature_name,
+                "type": feature_type,
+                "parameters": feature_parameters,
+            },
+        )
+        self.cache.invalidate(("state", project_slug))
+        if not r.ok:
+            print(f"Error adding feature: {self._parse_error(r)}")
+        else:
+            print("Feature in training")
+
+    async def get_features_data(
+        self,
+        project_slug: str,
+        features: list[str],
+        format: str = "csv",
+        return_type: str = "pandas",
+    ):
+        """
+        Get features from a project (csv), as "pandas", "arrow", "records" or "raw"
+        """
+        check_return_type(return_type)
+        r = await self._request(
+            "GET",
+            "/export/features",
+            params={
+                "project_slug": project_slug,
+                "features": features,
+                "format": format,
+            },
+        )
+        if not r.ok:
+            raise Exception(f"Error getting features data: {self._parse_error(r)}")
+        try:
+            if return_type == "pandas":
+                return await asyncio.to_thread(pd.read_csv, io.BytesIO(r.content))
+            return await asyncio.to_thread(read_csv_as, io.BytesIO(r.content), return_type)
+        except Exception as e:
+            raise Exception(f"Error parsing features data: {e}")
+
+    async def get_schemes(self, project_slug: str):
+        """
+        Get schemes of a project
+        """
+        return schemes_from_state(
+            await self.get_project_state(project_slug), project_slug
+        )
+
+    async def add_scheme_to_project(
+        self,
+        project_slug: str,
+        scheme: str,
+        labels: str | None = None,
+        kind: str = "multiclass",
+    ):
+        """
+        Add a scheme to a project
+        """
+        r = await self._request(
+            "POST",
+            "/schemes/add",
+            params={"project_slug": project_slug},
+            json={
+                "project_slug": project_slug,
+                "name": scheme,
+                "kind": kind,
+                "labels": labels,
+            },
+        )
+        self.cache.invalidate(("state", project_slug))
+        if not r.ok:
+            print(f"Error adding scheme: {self._parse_error(r)}")
+        else:
+            print("Scheme added to project")
+
+    async def delete_scheme_from_project(self, project_slug: str, scheme: str):
+        """
+        Delete a scheme from a project
+        """
+        r = await self._request(
+            "POST",
+            "/schemes/delete",
+            params={"project_slug": project_slug},
+            json={
+                "project_slug": project_slug,
+                "name": scheme,
+                "kind": "",
+                "labels": [],
+            },
+        )
+        self.cache.invalidate(("state", project_slug))
+        if not r.ok:
+            print(f"Error deleting scheme: {self._parse_error(r)}")
+        else:
+            print("Scheme deleted from project")
+
+    async def add_label_to_scheme(self, project_slug: str, scheme: str, label: str):
+        """
+        Add a label to a scheme
+        """
+        r = await self._request(
+            "POST",
+            "/schemes/label/add",
+            params={"project_slug": project_slug, "scheme": scheme, "label": label},
+        )
+        self.cache.invalidate(("state", project_slug))
+        if not r.ok:
+            print(f"Error adding label: {self._parse_error(r)}")
+        else:
+            print("Label added to scheme")
+
+    async def delete_label_from_scheme(
+        self, project_slug: str, scheme: str, label: str
+    ):
+        """
+        Delete a label from a scheme
+        """
+        r = await self._request(
+            "POST",
+            "/schemes/label/delete",
+            params={"project_slug": project_slug, "scheme": scheme, "label": label},
+        )
+        self.cache.invalidate(("state", project_slug))
+        if not r.ok:
+            print(f"Error deleting label: {self._parse_error(r)}")
+        else:
+            print("Label deleted from scheme")
+
+    async def download_raw_dataset(self, project_slug: str, folder: str = "./"):
+        """
+        Download raw dataset
+        """
+        r = await self._request(
+            "GET", "/export/raw", params={"project_slug": project_slug}
+        )
+        if not r.ok:
+            raise Exception(f"Error downloading raw dataset: {self._parse_error(r)}")
+        try:
+            data = r.json()
+            kwargs: dict = {}
+            url = self._prepare("/{path}", data, False, kwargs)
+            session = self._get_session()
+            async with self._semaphore:  # type: ignore[union-attr]
+                async with session.get(url, **kwargs) as response:
+                    if response.status >= 400:
+                        text = await response.text()
+                        raise Exception(
+                            f"Error fetching file: {parse_error_message(text, response.status)}"
+                        )
+                    with open(f"{folder}/{data['name']}", "wb") as out_file:
+                        async for chunk in response.content.iter_chunked(65536):
+                            out_file.write(chunk)
+        except Exception as e:
+            raise Exception(f"Error downloading raw dataset: {e}")
+
+    async def export_project(
+        self,
+        project_slug: str,
+        path: str = "./exports",
+        raw_datasets: bool = False,
+    ):
+        """
+        Save a project
+        for each scheme :
+            - save train/test/valid annotations
+
+        The csv sent by the server is written as is, without being parsed.
+        """
+        if not self.headers:
+            raise Exception("No token found")
+
+        print(f"Starting the export of project {project_slug}")
+
+        # create folder
+        if Path(f"{path}/{project_slug}").exists():
+            print(
+                "This project seems already be saved, check or delete the previous version"
+            )
+            return None
+
+        # create the folder
+        os.makedirs(f"{path}/{project_slug}")
+        path_project = f"{path}/{project_slug}"
+
+        # get the state of the project to save it
+        state = await self.get_project_state(project_slug)
+        with open(f"{path_project}/{project_slug}.json", "w") as f:
+            json.dump(state, f)
+
+        # get schemes annotation for each scheme, all pairs at once
+        schemes = schemes_from_state(state, project_slug)
+
+        async def save(scheme: str, dataset: str):
+            t = await self.get_annotations_data(
+                project_slug, scheme, dataset, return_type="raw"
+            )
+            if t is not None:
+                with open(
+                    f"{path_project}/annotations-scheme-{scheme}-{dataset}.csv", "wb"
+                ) as f:
+                    f.write(t)
+
+        await asyncio.gather(
+            *[
+                save(scheme, dataset)
+                for scheme in schemes
+                for dataset in ["train", "test", "valid"]
+            ]
+        )
+
+        print(f"Project {project_slug} saved with {len(schemes)} schemes")
+
+        # if requested, export raw dataset
+        if raw_datasets:
+            await self.download_raw_dataset(project_slug, path_project)
+            print("Raw dataset downloaded")
+
+        return None
+
+    async def export_all(
+        self,
+        path: str = "./exports",
+        raw_datasets: bool = False,
+        since: datetime | None = None,
+    ):
+        """
+        Save all the data
+
+        Filter from the last activity
+        """
+        projects = await self.get_projects()
+        if since is not None:
+            projects = [
+                project
+                for project in projects
+                if pd.to_datetime(project["last_activity"]) >= since
+            ]
+        await asyncio.gather(
+            *[
+                self.export_project(project["project_slug"], path, raw_datasets)
+                for project in projects
+            ]
+        )
+
+    async def get_models(self, project_slug: str) -> dict:
+        """
+        Get model state
+        """
+        r = await self.get_project_state(project_slug)
+        return {
+            "available": r["bertmodels"]["available"],
+            "training": r["bertmodels"]["training"],
+        }
+
+    async def stop_finetune_model(self, project_slug: str):
+        """
+        Stop training a model
+        """
+        r = await self._request("POST", "/stop", params={"project_slug": project_slug})
+        self.cache.invalidate(("state", project_slug))
+        if not r.ok:
+            print(f"Error stopping model: {self._parse_error(r)}")
+        else:
+            print("Model stopped")
+
+    async def start_finetune_model(
+        self,
+        project_slug: str,
+        scheme: str,
+        name: str,
+        base_model: str,
+        params: dict | None = None,
+        test_size: float = 0.2,
+        dichotomize: str | None = None,
+        class_min_freq: int = 1,
+        class_balance: bool = False,
+    ):
+        """
+        Start training a model
+        """
+        if params is None:
+            params = {
+                "batchsize": 4,
+                "gradacc": 1,
+                "epochs": 3,
+                "lrate": 5e-05,
+                "wdecay": 0.01,
+                "best": True,
+                "eval": 10,
+                "gpu": True,
+                "adapt": True,
+            }
+
+        payload = {
+            "project_slug": project_slug,
+            "scheme": scheme,
+            "name": name,
+            "base_model": base_model,
+            "params": params,
+            "test_size": test_size,
+            "dichotomize": dichotomize,
+            "class_min_freq": class_min_freq,
+            "class_balance": class_balance,
+        }
+
+        r = await self._request(
+            "POST",
+            "/models/bert/train",
+            params={"project_slug": project_slug},
+            json=payload,
+        )
+        self.cache.invalidate(("state", project_slug))
+        if not r.ok:
+            print(f"Error starting model training: {self._parse_error(r)}")
+        else:
+            print("Model in training")
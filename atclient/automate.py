@@ -2,30 +2,36 @@
 Reusable helpers for ActiveTigger API test scripts.
 
 Provides config loading, project/user lifecycle management,
-and a simple CLI assertion helper.
+a shared poller for waiting on projects, and a simple CLI assertion helper.
 """
 
+import random
 import sys
+import threading
 import time
 import uuid
+import weakref
+from concurrent.futures import Future
 from contextlib import contextmanager
 from pathlib import Path
 
-import pandas as pd  # type: ignore[import]
-
+from .lazy import lazy_import
 from .pyactivetigger import AtApi
 
+pd = lazy_import("pandas")
+
 # Resolve paths relative to the repo root (parent of atclient/)
 _REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_CONFIG = _REPO_ROOT / "tests" / "config.yaml"
 DEFAULT_DATA = _REPO_ROOT / "data" / "dataset.parquet"
 
 
-def load_api(config=None):
+def load_api(config=None, **kwargs):
     """Create an authenticated AtApi from a config file.
 
     Args:
         config: Path to a YAML config file. Defaults to tests/config.yaml.
+        **kwargs: Passed to AtApi (pool size, cache, retry policy...).
 
     Returns:
         An authenticated AtApi instance.
@@ -34,7 +40,7 @@ def load_api(config=None):
         Exception: If the config file is missing or authentication fails.
     """
     config = str(config or DEFAULT_CONFIG)
-    api = AtApi(config=config)
+    api = AtApi(config=config, **kwargs)
     if api.headers is None:
         raise Exception(f"Authentication failed using config {config}")
     return api
@@ -59,14 +65,179 @@ def make_project_name(prefix="test"):
     return f"{prefix}-{suffix}"
 
 
+class ProjectPoller:
+    """Shared poller multiplexing every waiter of one AtApi.
+
+    Each tick fetches the project list once for all the waiters. A project
+    state is only fetched for slugs with waiters, once per tick whatever the
+    number of waiters, and for training waiters only when the project's
+    last_activity changed or state_interval elapsed. The tick interval backs
+    off exponentially (with jitter) while nothing changes.
+
+    Args:
+        api: Authenticated AtApi instance.
+        min_interval: Seconds between ticks after a change.
+        max_interval: Maximum seconds between ticks.
+        state_interval: Seconds before re-fetching an unchanged project state.
+        jitter: Relative random spread applied to each interval.
+    """
+
+    def __init__(
+        self, api, min_interval=1.0, max_interval=15.0, state_interval=5.0, jitter=0.2
+    ):
+        self.api = api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.state_interval = state_interval
+        self.jitter = jitter
+        self._waiters = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._interval = min_interval
+        self._last_activity = {}
+        self._checked = {}
+
+    def wait_project(self, slug, timeout=60, callback=None):
+        """Future resolved with the project state once the project is accessible."""
+        return self._add("project", slug, timeout, callback)
+
+    def wait_training(self, slug, timeout=30, callback=None):
+        """Future resolved with the models dict once a training is detected."""
+        return self._add("training", slug, timeout, callback)
+
+    def _add(self, kind, slug, timeout, callback):
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        with self._cond:
+            self._waiters.append((kind, slug, time.monotonic() + timeout, future))
+            self._interval = self.min_interval
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    if not self._waiters:
+                        self._thread = None
+                        return
+                    waiters = list(self._waiters)
+                changed = self._tick(waiters)
+                with self._cond:
+                    self._waiters = [w for w in self._waiters if not w[3].done()]
+                    if not self._waiters:
+                        self._thread = None
+                        return
+                    if changed:
+                        self._interval = self.min_interval
+                    else:
+                        self._interval = min(self._interval * 2, self.max_interval)
+                    spread = 1 + random.uniform(-self.jitter, self.jitter)
+                    # wake up for the first deadline rather than overrun it
+                    until_deadline = min(w[2] for w in self._waiters) - time.monotonic()
+                    self._cond.wait(max(0.0, min(self._interval * spread, until_deadline)))
+        except BaseException as e:
+            # the thread dies: no waiter may be left waiting for it
+            with self._cond:
+                waiters, self._waiters = self._waiters, []
+                self._thread = None
+            for *_, future in waiters:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+    def _tick(self, waiters):
+        """Poll once for all the waiters, return whether anything changed."""
+        now = time.monotonic()
+        changed = False
+        try:
+            self.api.cache.invalidate(("projects",))
+            projects = {
+                p["parameters"]["project_slug"]: p for p in self.api.get_projects()
+            }
+        except Exception:
+            projects = None  # keep waiting, the API may be busy
+
+        states = {}
+        for kind, slug, deadline, future in waiters:
+            if future.done():
+                continue
+            try:
+                changed |= self._check(kind, slug, deadline, future, projects, states, now)
+            except Exception as e:
+                # an unexpected state fails its waiter, not the poller
+                if not future.done():
+                    future.set_exception(e)
+        return changed
+
+    def _check(self, kind, slug, deadline, future, projects, states, now):
+        """Resolve one waiter if possible, return whether anything changed."""
+        changed = False
+        if projects is not None and slug in projects:
+            activity = projects[slug].get("last_activity")
+            fresh = (
+                kind == "project"
+                or self._last_activity.get(slug) != activity
+                or now - self._checked.get(slug, 0) >= self.state_interval
+            )
+            if fresh and slug not in states:
+                try:
+                    self.api.cache.invalidate(("state", slug))
+                    states[slug] = self.api.get_project_state(slug)
+                    self._checked[slug] = now
+                    changed |= self._last_activity.get(slug) != activity
+                    self._last_activity[slug] = activity
+                except Exception:
+                    states[slug] = None  # API may 404 while project is being created
+            state = states.get(slug)
+            if state is not None:
+                if kind == "project":
+                    future.set_result(state)
+                    return True
+                models = {
+                    "available": state["bertmodels"]["available"],
+                    "training": state["bertmodels"]["training"],
+                }
+                if models["training"]:
+                    future.set_result(models)
+                    return True
+        if now >= deadline:
+            if kind == "project":
+                message = f"Project '{slug}' not accessible after timeout"
+            else:
+                message = f"No model training detected for '{slug}' after timeout"
+            future.set_exception(TimeoutError(message))
+        return changed
+
+
+_pollers = weakref.WeakKeyDictionary()
+_pollers_lock = threading.Lock()
+
+
+def get_poller(api, poll_interval=3):
+    """Return the ProjectPoller shared by every waiter of an AtApi."""
+    with _pollers_lock:
+        poller = _pollers.get(api)
+        if poller is None:
+            poller = ProjectPoller(api, min_interval=poll_interval)
+            _pollers[api] = poller
+        return poller
+
+
 def wait_for_project(api, slug, timeout=60, poll_interval=3):
-    """Poll until a project is accessible.
+    """Wait until a project is accessible.
+
+    The wait is registered on the poller shared by all the waiters of api.
 
     Args:
         api: Authenticated AtApi instance.
         slug: Project slug to wait for.
         timeout: Maximum seconds to wait before raising TimeoutError.
-        poll_interval: Seconds between polls.
+        poll_interval: Minimum seconds between polls.
 
     Returns:
         The project state dict once available.
@@ -74,31 +245,25 @@ def wait_for_project(api, slug, timeout=60, poll_interval=3):
     Raises:
         TimeoutError: If the project is not accessible within the timeout.
     """
-    deadline = time.monotonic() + timeout
-    while True:
-        try:
-            slugs = api.get_projects_slugs()
-            if slug in slugs:
-                state = api.get_project_state(slug)
-                return state
-        except Exception:
-            pass  # API may 404 while project is being created
-
-        if time.monotonic() >= deadline:
-            raise TimeoutError(
-                f"Project '{slug}' not accessible after {timeout}s"
-            )
-        time.sleep(poll_interval)
+    future = get_poller(api, poll_interval).wait_project(slug, timeout)
+    try:
+        # honoured even if the poller stalls
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Project '{slug}' not accessible after {timeout}s")
 
 
 def wait_for_training(api, slug, timeout=30, poll_interval=3):
-    """Poll until model training is detected.
+    """Wait until model training is detected.
+
+    The wait is registered on the poller shared by all the waiters of api.
 
     Args:
         api: Authenticated AtApi instance.
         slug: Project slug.
         timeout: Maximum seconds to wait before raising TimeoutError.
-        poll_interval: Seconds between polls.
+        poll_interval: Minimum seconds between polls.
 
     Returns:
         The models dict (with 'available' and 'training' keys).
@@ -106,20 +271,14 @@ def wait_for_training(api, slug, timeout=30, poll_interval=3):
     Raises:
         TimeoutError: If no training is detected within the timeout.
     """
-    deadline = time.monotonic() + timeout
-    while True:
-        try:
-            models = api.get_models(slug)
-            if models["training"]:
-                return models
-        except Exception:
-            pass
-
-        if time.monotonic() >= deadline:
-            raise TimeoutError(
-                f"No model training detected for '{slug}' after {timeout}s"
-            )
-        time.sleep(poll_interval)
+    future = get_poller(api, poll_interval).wait_training(slug, timeout)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        raise TimeoutError(
+            f"No model training detected for '{slug}' after {timeout}s"
+        )
 
 
 def create_test_project(
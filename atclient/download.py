@@ -0,0 +1,209 @@
+"""
+Resumable, segmented file downloader.
+
+Large files are fetched with HTTP Range requests in parallel segments into a
+preallocated `.part` file. The progress of each segment is saved next to it
+in `.part.json`, so a failed download resumes where it stopped.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import requests  # type: ignore[import]
+
+CHUNK_SIZE = 1 << 20
+
+
+def _probe(request: Callable[..., requests.Response]) -> tuple[int | None, bool, str]:
+    """
+    Return (size, accepts ranges, validator) of the remote file
+    """
+    r = request("GET", headers={"Range": "bytes=0-0"}, stream=True)
+    try:
+        if not r.ok:
+            raise Exception(f"Error fetching file: HTTP {r.status_code}")
+        validator = r.headers.get("ETag") or r.headers.get("Last-Modified") or ""
+        match = re.match(r"bytes 0-0/(\d+)", r.headers.get("Content-Range", ""))
+        if r.status_code == 206 and match:
+            return int(match.group(1)), True, validator
+        length = r.headers.get("Content-Length")
+        return (int(length) if length else None), False, validator
+    finally:
+        r.close()
+
+
+def _segments(size: int, n: int, min_size: int) -> list[list[int]]:
+    """
+    Split [0, size) in at most n segments of [start, end, done]
+    """
+    n = max(1, min(n, size // max(1, min_size) or 1))
+    step = -(-size // n)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+
+def download_file(
+    request: Callable[..., requests.Response],
+    dest: str | Path,
+    segments: int = 4,
+    segment_min_size: int = 8 << 20,
+    checksum: str | None = None,
+    retries: int = 3,
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Download a file with parallel Range requests, resuming a previous attempt
+
+    Args:
+        request: callable sending `request(method, **kwargs)` to the file url
+        dest: destination path
+        segments: maximum number of parallel segments
+        segment_min_size: minimum size of a segment in bytes
+        checksum: expected sha256 hex digest ("sha256:" prefix allowed)
+        retries: attempts per segment before giving up
+        progress: called with the download statistics while downloading
+
+    Returns a dict with:
+        - path (str), bytes (int), resumed_bytes (int), segments (int)
+        - seconds (float), throughput_mb_s (float), sha256 (str)
+    """
+    dest = Path(dest)
+    part = dest.with_name(dest.name + ".part")
+    state_path = dest.with_name(dest.name + ".part.json")
+    start_time = time.monotonic()
+
+    size, ranges, validator = _probe(request)
+
+    # resume a previous attempt on the same remote file
+    state = None
+    if ranges and part.exists() and state_path.exists():
+        with open(state_path, "r") as f:
+            state = json.load(f)
+        if state.get("size") != size or state.get("validator") != validator:
+            state = None
+    if state is None:
+        state = {
+            "size": size,
+            "validator": validator,
+            "segments": _segments(size, segments, segment_min_size)
+            if ranges and size
+            else [[0, (size or 0) - 1, 0]],
+        }
+        with open(part, "wb") as f:
+            if size:
+                f.truncate(size)
+    resumed = sum(segment[2] for segment in state["segments"])
+
+    lock = threading.Lock()
+    save_lock = threading.Lock()
+    downloaded = [resumed]
+
+    def save_state() -> None:
+        with save_lock:
+            with lock:
+                content = json.dumps(state)
+            tmp = state_path.with_name(state_path.name + ".tmp")
+            with open(tmp, "w") as f:
+                f.write(content)
+            os.replace(tmp, state_path)
+
+    def report() -> None:
+        if progress is None:
+            return
+        elapsed = time.monotonic() - start_time
+        progress(
+            {
+                "bytes": downloaded[0],
+                "size": size,
+                "seconds": round(elapsed, 3),
+                "throughput_mb_s": round(
+                    (downloaded[0] - resumed) / elapsed / 1e6 if elapsed else 0.0, 3
+                ),
+            }
+        )
+
+    def fetch(segment: list[int]) -> None:
+        for attempt in range(retries):
+            start, end, done = segment
+            if ranges and done > end - start:
+                return
+            headers = {"Range": f"bytes={start + done}-{end}"} if ranges else {}
+            try:
+                r = request("GET", headers=headers, stream=True)
+                try:
+                    if not r.ok:
+                        raise Exception(f"Error fetching file: HTTP {r.status_code}")
+                    if ranges and r.status_code != 206:
+                        raise Exception("Server ignored the Range request")
+                    # unbuffered, so the saved state never runs ahead of the file
+                    with open(part, "r+b", buffering=0) as f:
+                        f.seek(start + done)
+                        since_save = 0
+                        for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                            f.write(chunk)
+                            with lock:
+                                segment[2] += len(chunk)
+                                downloaded[0] += len(chunk)
+                            since_save += len(chunk)
+                            if since_save >= 16 * CHUNK_SIZE:
+                                save_state()
+                                since_save = 0
+                            report()
+                finally:
+                    r.close()
+                if not ranges and size is None:
+                    return
+                if segment[2] > end - start:
+                    return
+                raise Exception("Connection closed before the end of the segment")
+            except Exception:
+                if ranges:
+                    save_state()
+                else:
+                    downloaded[0] -= segment[2]
+                    segment[2] = 0
+                if attempt == retries - 1:
+                    raise
+                time.sleep(min(2**attempt, 10))
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(state["segments"])) as executor:
+            list(executor.map(fetch, state["segments"]))
+    finally:
+        if ranges:
+            save_state()
+
+    # verify size and checksum before moving the file in place
+    actual_size = part.stat().st_size
+    if size is not None and actual_size != size:
+        raise Exception(f"Downloaded size {actual_size} differs from {size}")
+    digest = hashlib.sha256()
+    with open(part, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    sha256 = digest.hexdigest()
+    if checksum is not None and checksum.removeprefix("sha256:").lower() != sha256:
+        part.unlink(missing_ok=True)
+        state_path.unlink(missing_ok=True)
+        raise Exception(f"Checksum mismatch for {dest.name}")
+
+    os.replace(part, dest)
+    state_path.unlink(missing_ok=True)
+    elapsed = time.monotonic() - start_time
+    return {
+        "path": str(dest),
+        "bytes": actual_size,
+        "resumed_bytes": resumed,
+        "segments": len(state["segments"]),
+        "seconds": round(elapsed, 3),
+        "throughput_mb_s": round(
+            (actual_size - resumed) / elapsed / 1e6 if elapsed else 0.0, 3
+        ),
+        "sha256": sha256,
+    }
@@ -0,0 +1,68 @@
+"""
+Manifest of an export folder, used by incremental exports.
+
+For each project, the manifest stores its last_activity, a hash of its
+state and the content hash of every file written, so a new export only
+rewrites what changed.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+def hash_bytes(content: bytes) -> str:
+    """Content hash of a file."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_state(state: dict) -> str:
+    """Hash of a project state, independent of the key order."""
+    return hash_bytes(json.dumps(state, sort_keys=True, default=str).encode("utf-8"))
+
+
+def write_atomic(path: str | Path, content: bytes) -> None:
+    """Write a file through a temporary file renamed in place."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class ExportManifest:
+    """
+    Thread-safe manifest stored as `manifest.json` in an export root
+    """
+
+    FILENAME = "manifest.json"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path) / self.FILENAME
+        self._lock = threading.Lock()
+        self.projects: dict[str, dict] = {}
+        if self.path.is_file():
+            with open(self.path, "r") as f:
+                self.projects = json.load(f).get("projects", {})
+
+    def get(self, project_slug: str) -> dict | None:
+        with self._lock:
+            entry = self.projects.get(project_slug)
+            return json.loads(json.dumps(entry)) if entry is not None else None
+
+    def update(self, project_slug: str, entry: dict) -> None:
+        with self._lock:
+            self.projects[project_slug] = entry
+
+    def save(self) -> None:
+        with self._lock:
+            content = json.dumps({"projects": self.projects}, indent=2)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.path, content.encode("utf-8"))
@@ -0,0 +1,181 @@
+"""
+Per-endpoint request metrics.
+
+Every request sent by AtApi is recorded under its endpoint template, method
+and status: a latency histogram with fixed buckets, request and response
+bytes, and retries. Recording is a bisect and a few additions under a lock.
+The metrics export as a JSON snapshot or in the Prometheus text format.
+"""
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable
+
+# upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0,
+)
+
+
+@dataclass(frozen=True)
+class RequestRecord:
+    """
+    One request as seen by the client
+
+    status is 0 when no response was received.
+    """
+
+    endpoint: str
+    method: str
+    status: int
+    latency: float
+    request_bytes: int
+    response_bytes: int
+    retries: int
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "latency_sum", "request_bytes", "response_bytes", "retries")
+
+    def __init__(self, n_buckets: int):
+        self.buckets = [0] * (n_buckets + 1)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+
+
+class RequestMetrics:
+    """
+    Thread-safe histograms and counters by (endpoint, method, status)
+
+    Hooks registered with add_hook are called with each RequestRecord, from
+    the thread that sent the request.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str, int], _Series] = {}
+        self.hooks: list[Callable[[RequestRecord], None]] = []
+
+    def add_hook(self, hook: Callable[[RequestRecord], None]) -> None:
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[RequestRecord], None]) -> None:
+        self.hooks.remove(hook)
+
+    def record(
+        self,
+        endpoint: str,
+        method: str,
+        status: int,
+        latency: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        retries: int = 0,
+    ) -> None:
+        key = (endpoint, method, status)
+        index = bisect_left(self.buckets, latency)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets))
+            series.buckets[index] += 1
+            series.count += 1
+            series.latency_sum += latency
+            series.request_bytes += request_bytes
+            series.response_bytes += response_bytes
+            series.retries += retries
+        if self.hooks:
+            record = RequestRecord(
+                endpoint, method, status, latency, request_bytes, response_bytes, retries
+            )
+            for hook in self.hooks:
+                try:
+                    hook(record)
+                except Exception as e:
+                    print(f"Error in metrics hook: {e}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _quantile(self, counts: list[int], total: int, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile"""
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        """
+        JSON-serialisable view of the metrics
+
+        Returns a dict with:
+            - buckets (list): upper bounds of the latency buckets in seconds
+            - series (list): one dict per endpoint/method/status with count,
+              errors, latency_sum, latency_p50/p95/p99 (bucket bounds),
+              request_bytes, response_bytes, retries and bucket counts
+        """
+        with self._lock:
+            items = [
+                (key, list(s.buckets), s.count, s.latency_sum, s.request_bytes, s.response_bytes, s.retries)
+                for key, s in self._series.items()
+            ]
+        series = []
+        for (endpoint, method, status), counts, count, latency_sum, sent, received, retries in sorted(items):
+            series.append(
+                {
+                    "endpoint": endpoint,
+                    "method": method,
+                    "status": status,
+                    "count": count,
+                    "errors": count if status == 0 or status >= 400 else 0,
+                    "latency_sum": round(latency_sum, 6),
+                    "latency_p50": self._quantile(counts, count, 0.5),
+                    "latency_p95": self._quantile(counts, count, 0.95),
+                    "latency_p99": self._quantile(counts, count, 0.99),
+                    "request_bytes": sent,
+                    "response_bytes": received,
+                    "retries": retries,
+                    "bucket_counts": counts,
+                }
+            )
+        return {"buckets": list(self.buckets), "series": series}
+
+    def to_prometheus(self, prefix: str = "atclient") -> str:
+        """Metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        bounds = [str(b) for b in snapshot["buckets"]] + ["+Inf"]
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds Latency of the requests to the API.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        counters = []
+        for s in snapshot["series"]:
+            labels = f'endpoint="{s["endpoint"]}",method="{s["method"]}",status="{s["status"]}"'
+            cumulative = 0
+            for bound, count in zip(bounds, s["bucket_counts"]):
+                cumulative += count
+                lines.append(
+                    f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {s['latency_sum']}")
+            lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {s['count']}")
+            counters.append((labels, s))
+        for name, key, help_text in (
+            ("request_bytes_total", "request_bytes", "Bytes sent in request bodies."),
+            ("response_bytes_total", "response_bytes", "Bytes received in response bodies."),
+            ("request_retries_total", "retries", "Retries of the requests."),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, s in counters:
+                lines.append(f"{prefix}_{name}{{{labels}}} {s[key]}")
+        return "\n".join(lines) + "\n"
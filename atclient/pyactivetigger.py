@@ -1,27 +1,330 @@
+from __future__ import annotations
+
+import csv
+import gzip
 import io
 import json
 import os
+import shutil
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Callable, List
 
-import pandas as pd  # type: ignore[import]
 import requests  # type: ignore[import]
-import yaml  # type: ignore[import]
-from requests.packages.urllib3.exceptions import (  # type: ignore[import]
-    InsecureRequestWarning,
-)
 
-requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+from .cache import TTLCache
+from .download import download_file
+from .lazy import lazy_import
+from .manifest import ExportManifest, hash_bytes, hash_state, write_atomic
+from .metrics import RequestMetrics
+from .registry import DatasetRegistry, fingerprint
+from .retry import CircuitBreaker, RetryPolicy, RetryStats, get_breaker, never_sent
+from .session import DEFAULT_TIMEOUTS, POOL_TIMEOUT, make_session, pool_stats
+from .tokens import REFRESH_MARGIN, TokenCache, is_fresh, jwt_expiry
+from .upload import MultipartCsvStream, estimate_payload, format_size, minimize_frame
+from .validation import check_dataset
+from .watch import ProjectEvent, Watcher
+
+if TYPE_CHECKING:
+    import numpy as np  # type: ignore[import]
+    import pandas as pd  # type: ignore[import]
+    import yaml  # type: ignore[import]
+else:
+    # imported on first use: pinging or listing projects does not load pandas
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+    yaml = lazy_import("yaml")
+
+
+def parse_error_message(text: str, status_code: int) -> str:
+    """Extract a readable error message from the body of an error response."""
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict) and "detail" in data:
+            detail = data["detail"]
+            if isinstance(detail, list):
+                return "; ".join(
+                    f"{'.'.join(str(loc) for loc in e.get('loc', []))}: {e.get('msg', '')}"
+                    for e in detail
+                )
+            return str(detail)
+    except Exception:
+        pass
+    return text or f"HTTP {status_code}"
+
+
+# known columns of the annotation exports, other columns are inferred
+ANNOTATION_DTYPES = {
+    "id": "string",
+    "text": "string",
+    "label": "category",
+    "labels": "category",
+}
+
+
+def read_csv_stream(stream, dtype: dict | None = None) -> pd.DataFrame:
+    """Parse a csv file object with the pyarrow engine, or the C one without pyarrow."""
+    try:
+        import pyarrow  # type: ignore[import] # noqa: F401
+
+        engine = "pyarrow"
+    except ImportError:
+        engine = "c"
+    return pd.read_csv(stream, engine=engine, dtype=dtype)
+
+
+class CsvChunks:
+    """
+    Iterator of DataFrames of chunksize rows read from a streamed csv response
+
+    The reader is opened at once; the response is closed when the iterator is
+    exhausted, closed, used as a context manager or garbage collected, so an
+    iterator dropped unconsumed still releases its pooled connection.
+    """
+
+    def __init__(self, r: requests.Response, chunksize: int, dtype: dict | None = None):
+        self._response = None
+        try:
+            self._reader = pd.read_csv(r.raw, dtype=dtype, chunksize=chunksize)
+        except BaseException:
+            r.close()
+            raise
+        self._response = r
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> pd.DataFrame:
+        if self._response is None:
+            raise StopIteration
+        try:
+            return next(self._reader)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Close the reader and release the connection."""
+        r, self._response = self._response, None
+        if r is not None:
+            try:
+                self._reader.close()
+            finally:
+                r.close()
+
+    def __del__(self):
+        self.close()
+
+
+def iter_csv_chunks(r: requests.Response, chunksize: int, dtype: dict | None = None) -> CsvChunks:
+    """DataFrames of chunksize rows from a streamed csv response (see CsvChunks)."""
+    return CsvChunks(r, chunksize, dtype)
+
+
+RETURN_TYPES = ("pandas", "arrow", "records", "raw")
+
+
+def check_return_type(return_type: str) -> None:
+    """Raise if return_type is not one of RETURN_TYPES."""
+    if return_type not in RETURN_TYPES:
+        raise ValueError(
+            f"return_type must be one of {', '.join(RETURN_TYPES)}, not {return_type!r}"
+        )
+
+
+def read_arrow_csv(stream, dtype: dict | None = None):
+    """Parse a csv file object into a pyarrow Table, without going through pandas."""
+    import pyarrow as pa  # type: ignore[import]
+    import pyarrow.csv as pa_csv  # type: ignore[import]
+
+    arrow_types = {
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+    }
+    options = pa_csv.ConvertOptions(
+        column_types={c: arrow_types[t] for c, t in (dtype or {}).items() if t in arrow_types},
+        strings_can_be_null=True,
+    )
+    return pa_csv.read_csv(stream, convert_options=options)
+
+
+def read_csv_as(stream, return_type: str = "pandas", dtype: dict | None = None):
+    """
+    Parse a csv file object into a DataFrame, a pyarrow Table, a list of
+    dicts or the raw bytes, following return_type
+    """
+    if return_type == "raw":
+        return stream.read()
+    if return_type == "arrow":
+        return read_arrow_csv(stream, dtype)
+    if return_type == "records":
+        try:
+            return read_arrow_csv(stream, dtype).to_pylist()
+        except ImportError:
+            # without pyarrow, values are kept as strings
+            reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8"))
+            return [{k: v if v != "" else None for k, v in row.items()} for row in reader]
+    return read_csv_stream(stream, dtype)
+
+
+def count_rows(data) -> int:
+    """Number of rows of a result of read_csv_as (header excluded for raw csv)."""
+    if isinstance(data, bytes):
+        return max(0, data.count(b"\n") - 1 + (not data.endswith(b"\n") and bool(data)))
+    if hasattr(data, "num_rows"):
+        return data.num_rows
+    return len(data)
+
+
+def bulk_call(
+    exists: bool,
+    request: Callable[[], requests.Response],
+    parse_error: Callable[[requests.Response], str],
+) -> dict:
+    """Run one call of a bulk operation and describe its outcome."""
+    if exists:
+        return {"result": "skipped", "error": None, "latency_ms": 0.0}
+    start = time.monotonic()
+    try:
+        r = request()
+        error = None if r.ok else parse_error(r)
+    except Exception as e:
+        error = str(e)
+    latency = round((time.monotonic() - start) * 1000, 2)
+    if error is None:
+        return {"result": "created", "error": None, "latency_ms": latency}
+    return {"result": "failed", "error": error, "latency_ms": latency}
+
+
+def cell_or(value, default):
+    """Value of a table cell, or default when the cell is empty (None or NaN)."""
+    return default if value is None or pd.isna(value) else value
+
+
+def run_bulk(
+    call: Callable[[dict], dict], rows: list[dict], duplicates: list[bool], max_workers: int
+) -> list[dict]:
+    """Run call on the rows with bounded concurrency, skipping duplicates."""
+    skipped = {"result": "skipped", "error": "duplicate row", "latency_ms": 0.0}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [
+            None if duplicate else executor.submit(call, row)
+            for row, duplicate in zip(rows, duplicates)
+        ]
+        return [dict(skipped) if f is None else f.result() for f in futures]
+
+
+def schemes_from_state(state: dict, project_slug: str):
+    """Available schemes in a project state."""
+    if "schemes" in state:
+        return state["schemes"]["available"]
+    raise Exception(f"No schemes found for project {project_slug}")
+
+
+def users_from_state(state: dict) -> set:
+    """Users with an access to the project of a state."""
+    users = state.get("users") or {}
+    return set(users.get("users", []) if isinstance(users, dict) else users)
+
+
+def check_columns(data: pd.DataFrame, columns: List[str]) -> None:
+    """Raise if one of the columns is missing from the data."""
+    for col in columns:
+        if col not in data.columns:
+            raise Exception(f"Column {col} not found in data")
 
 
 class AtApi:
-    def __init__(self, url: str | None = None, config: str | None = None):
+    def __init__(
+        self,
+        url: str | None = None,
+        config: str | None = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = True,
+        pool_timeout: float | None = POOL_TIMEOUT,
+        timeouts: dict | None = None,
+        headers: dict[str, str] | None = None,
+        cache_ttl: float = 2.0,
+        cache_size: int = 256,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        token_cache: TokenCache | str | bool | None = None,
+        metrics: RequestMetrics | bool = True,
+        dataset_registry: DatasetRegistry | str | bool | None = None,
+    ):
         """
         Initialize the client
+
+        Args:
+            url: url of the API (ignored if config is provided)
+            config: path to a YAML config file with url/username/password
+            pool_connections: number of per-host connection pools
+            pool_maxsize: maximum number of kept-alive connections per host
+            pool_block: wait for a free connection when the pool is exhausted
+            pool_timeout: seconds to wait for a free connection before raising
+                PoolTimeout (None to wait forever)
+            timeouts: per-endpoint timeouts, merged over DEFAULT_TIMEOUTS
+            headers: default headers sent with every request
+            cache_ttl: seconds project states and the project list are cached (0 to disable)
+            cache_size: maximum number of cached entries
+            retry: retry policy (RetryPolicy() by default, RetryPolicy(total=0) to disable)
+            circuit_breaker: circuit breaker (shared one of the host by default)
+            token_cache: TokenCache, path of its file, or True for the default
+                one, to share tokens between processes
+            metrics: record per-endpoint request metrics (False to disable, or
+                a RequestMetrics shared by several clients)
+            dataset_registry: DatasetRegistry, path of its file, or True for the
+                default one, to create projects from_project instead of uploading
+                a dataset already uploaded
         """
         self.headers: dict[str, str] | None = None
+        self.token_cache = (
+            TokenCache()
+            if token_cache is True
+            else TokenCache(token_cache)
+            if isinstance(token_cache, (str, Path))
+            else token_cache or None
+        )
+        self.dataset_registry = (
+            DatasetRegistry()
+            if dataset_registry is True
+            else DatasetRegistry(dataset_registry)
+            if isinstance(dataset_registry, (str, Path))
+            else dataset_registry or None
+        )
+        self._credentials: tuple[str, str] | None = None
+        self._token_expiry: float | None = None
+        self._auth_lock = threading.Lock()
+        self.retry = retry or RetryPolicy()
+        self._retry_counters = RetryStats()
+        self.breaker = circuit_breaker
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.cache = TTLCache(ttl=cache_ttl, maxsize=cache_size)
+        self.metrics = (
+            metrics
+            if isinstance(metrics, RequestMetrics)
+            else RequestMetrics()
+            if metrics
+            else None
+        )
+        self.session = make_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            pool_timeout=pool_timeout,
+            headers=headers,
+        )
         if config:
             if not Path(config).is_file():
                 raise Exception("Config file does not exist")
@@ -37,21 +340,252 @@ class AtApi:
                 raise Exception("Url not provided")
             self.url = url
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the pooled connections
+        """
+        self.session.close()
+
+    def pool_stats(self) -> dict:
+        """
+        Connection pool statistics
+
+        Returns a dict with:
+            - connections_opened (int): new connections established
+            - connections_reused (int): requests served by a kept-alive connection
+            - requests_waiting (int): requests currently blocked on a full pool
+            - requests_waited (int): requests that had to wait for a connection
+        """
+        return pool_stats(self.session)
+
+    def cache_stats(self) -> dict:
+        """
+        Cache statistics: hits, misses, evictions and current size
+        """
+        return self.cache.stats()
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        path_params: dict | None = None,
+        auth: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request to an endpoint template through the pooled session
+
+        Transient failures are retried following self.retry (idempotent
+        endpoints only, unless the request never reached the server), and
+        the circuit breaker of the host rejects requests while it is open.
+        """
+        if auth:
+            if not self.headers:
+                raise Exception("No token found")
+            if self._credentials and not is_fresh(self._token_expiry, self._refresh_margin()):
+                self._refresh_token(self.headers["Authorization"])
+            extra_headers = kwargs.pop("headers", {})
+            kwargs["headers"] = {**self.headers, **extra_headers}
+        kwargs.setdefault(
+            "timeout", self.timeouts.get(endpoint, self.timeouts["default"])
+        )
+        path = endpoint.format(**path_params) if path_params else endpoint
+        url = f"{self.url}{path}"
+        if self.breaker is None:
+            self.breaker = get_breaker(self.url)
+        idempotent = self.retry.is_idempotent(method, endpoint)
+
+        attempt = 0
+        refreshed = False
+        r = None
+        streamed = False
+        sent_at = time.perf_counter()
+        try:
+            while True:
+                r = None
+                self.breaker.before_request()
+                try:
+                    r = self.session.request(method, url, **kwargs)
+                except (
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                ) as e:
+                    self.breaker.record_failure()
+                    if attempt < self.retry.total and (idempotent or never_sent(e)):
+                        self._retry_counters.incr("retries", endpoint)
+                        time.sleep(self.retry.backoff(attempt))
+                        attempt += 1
+                        continue
+                    self._retry_counters.incr("giveups", endpoint)
+                    raise
+                except BaseException:
+                    # client-side error (invalid url, interrupt...): says nothing of the host
+                    self.breaker.release_trial()
+                    raise
+                if r.status_code in self.retry.status_forcelist:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if r.status_code in self.retry.status_forcelist:
+                    if attempt < self.retry.total and idempotent:
+                        self._retry_counters.incr("retries", endpoint)
+                        delay = self.retry.backoff(attempt, r)
+                        r.close()
+                        time.sleep(delay)
+                        attempt += 1
+                        continue
+                    self._retry_counters.incr("giveups", endpoint)
+                if r.status_code == 401 and auth and self._credentials and not refreshed:
+                    # expired or revoked token: log in again and replay once
+                    r.close()
+                    self._refresh_token(kwargs["headers"]["Authorization"])
+                    kwargs["headers"] = {**kwargs["headers"], **self.headers}
+                    refreshed = True
+                    continue
+                streamed = bool(kwargs.get("stream"))
+                return r
+        finally:
+            if self.metrics is not None:
+                if streamed:
+                    self._record_metrics_on_close(method, endpoint, r, sent_at, attempt)
+                else:
+                    self._record_metrics(method, endpoint, r, sent_at, attempt)
+
+    def _record_metrics_on_close(
+        self,
+        method: str,
+        endpoint: str,
+        r: requests.Response,
+        sent_at: float,
+        retries: int,
+    ) -> None:
+        """Record a streamed response once closed, with the time and bytes until then"""
+        close = r.close
+        recorded = threading.Event()
+
+        def close_and_record():
+            close()
+            if not recorded.is_set():
+                recorded.set()
+                self._record_metrics(method, endpoint, r, sent_at, retries, streamed=True)
+
+        r.close = close_and_record  # type: ignore[method-assign]
+
+    def _record_metrics(
+        self,
+        method: str,
+        endpoint: str,
+        r: requests.Response | None,
+        sent_at: float,
+        retries: int,
+        streamed: bool = False,
+    ) -> None:
+        latency = time.perf_counter() - sent_at
+        if r is None:
+            self.metrics.record(endpoint, method, 0, latency, retries=retries)
+            return
+        body = r.request.body
+        if isinstance(body, (bytes, str)):
+            request_bytes = len(body)
+        elif hasattr(body, "bytes_sent"):
+            # streamed body (MultipartCsvStream), sent without Content-Length
+            request_bytes = body.bytes_sent
+        else:
+            request_bytes = int(r.request.headers.get("Content-Length", 0))
+        if streamed:
+            # bytes read from the connection before the response was closed
+            tell = getattr(r.raw, "tell", None)
+            response_bytes = tell() if callable(tell) else 0
+        elif r.headers.get("Content-Length") is not None:
+            response_bytes = int(r.headers["Content-Length"])
+        else:
+            response_bytes = len(r.content)
+        self.metrics.record(
+            endpoint, method, r.status_code, latency, request_bytes, response_bytes, retries
+        )
+
+    def metrics_snapshot(self) -> dict:
+        """
+        Request metrics by endpoint template, method and status
+
+        See RequestMetrics.snapshot for the content; empty when metrics are disabled.
+        """
+        return self.metrics.snapshot() if self.metrics is not None else {}
+
+    def metrics_prometheus(self) -> str:
+        """
+        Request metrics in the Prometheus text format
+        """
+        return self.metrics.to_prometheus() if self.metrics is not None else ""
+
+    def _refresh_margin(self) -> float:
+        return self.token_cache.refresh_margin if self.token_cache else REFRESH_MARGIN
+
+    def fetch_token(self, username: str, password: str) -> str:
+        """
+        Post the credentials to /token and return the access token
+
+        The client keeps its current token: use connect to log in.
+        """
+        response = self._request(
+            "POST",
+            "/token",
+            auth=False,
+            data={"username": username, "password": password},
+        )
+        response.raise_for_status()
+        access_token = response.json().get("access_token")
+        if not access_token:
+            raise ValueError("no access token in response")
+        return access_token
+
+    def _set_token(self, username: str, access_token: str) -> None:
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+            "username": username,
+        }
+        self._token_expiry = jwt_expiry(access_token)
+
+    def _refresh_token(self, stale_authorization: str) -> None:
+        """
+        Replace a stale token, once for all the threads that saw it
+
+        With a token cache, a token refreshed meanwhile by another process
+        is reused instead of logging in again.
+        """
+        with self._auth_lock:
+            if self.headers and self.headers["Authorization"] != stale_authorization:
+                return
+            username, password = self._credentials
+            if self.token_cache:
+                self.token_cache.invalidate(
+                    self.url, username, stale_authorization.removeprefix("Bearer ")
+                )
+                token = self.token_cache.get_or_fetch(
+                    self.url, username, password, lambda: self.fetch_token(username, password)
+                )
+            else:
+                token = self.fetch_token(username, password)
+            self._set_token(username, token)
+
+    def retry_stats(self) -> dict:
+        """
+        Retry counters (total and by endpoint) and circuit breaker state
+        """
+        return {
+            **self._retry_counters.as_dict(),
+            "circuit_breaker": self.breaker.stats() if self.breaker else None,
+        }
+
     def _parse_error(self, r: requests.Response) -> str:
         """Extract a readable error message from an error response."""
-        try:
-            data = r.json()
-            if isinstance(data, dict) and "detail" in data:
-                detail = data["detail"]
-                if isinstance(detail, list):
-                    return "; ".join(
-                        f"{'.'.join(str(loc) for loc in e.get('loc', []))}: {e.get('msg', '')}"
-                        for e in detail
-                    )
-                return str(detail)
-        except Exception:
-            pass
-        return r.text or f"HTTP {r.status_code}"
+        return parse_error_message(r.text, r.status_code)
 
     def ping(self) -> dict:
         """
@@ -71,7 +605,7 @@ class AtApi:
         }
         try:
             start = time.monotonic()
-            r = requests.get(f"{self.url}/", verify=False, timeout=10)
+            r = self._request("GET", "/", auth=False)
             result["response_time_ms"] = round((time.monotonic() - start) * 1000, 2)
             result["status_code"] = r.status_code
             result["available"] = r.status_code == 200
@@ -82,65 +616,78 @@ class AtApi:
     def connect(self, username: str, password: str):
         """
         Get token access with username/password
+
+        The credentials are kept in memory to log in again when the token
+        expires. With a token cache, a valid token obtained by another
+        process with the same password is reused instead of posting to /token.
         """
         try:
-            response = requests.post(
-                f"{self.url}/token",
-                data={"username": username, "password": password},
-                verify=False,
-            )
-            response.raise_for_status()
-            token_data = response.json()
-        except requests.exceptions.HTTPError:
-            print(f"Error connecting: {self._parse_error(response)}")
+            if self.token_cache:
+                access_token = self.token_cache.get_or_fetch(
+                    self.url, username, password, lambda: self.fetch_token(username, password)
+                )
+            else:
+                access_token = self.fetch_token(username, password)
+        except requests.exceptions.HTTPError as e:
+            print(f"Error connecting: {self._parse_error(e.response)}")
             return
         except requests.exceptions.RequestException as e:
             print(f"Error connecting to endpoint: {e}")
             return
-        access_token = token_data.get("access_token")
-        if access_token:
-            self.headers = {
-                "Authorization": f"Bearer {access_token}",
-                "username": username,
-            }
-            print("Token received")
-        else:
-            print("Error: no access token in response")
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        self._set_token(username, access_token)
+        self._credentials = (username, password)
+        self.cache.clear()
+        print("Token received")
 
     def get_project_state(self, project_slug: str):
         """
         Get project state
+
+        The state is cached for cache_ttl seconds and shared by get_schemes
+        and get_models; do not modify the returned dict.
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.get(
-            f"{self.url}/projects/{project_slug}", headers=self.headers, verify=False
+        cached = self.cache.get(("state", project_slug))
+        if cached is not None:
+            return cached
+        r = self._request(
+            "GET",
+            "/projects/{project_slug}",
+            path_params={"project_slug": project_slug},
         )
         if not r.ok:
             raise Exception(f"Error getting project state: {self._parse_error(r)}")
-        return r.json()
+        state = r.json()
+        self.cache.set(("state", project_slug), state)
+        return state
 
     def get_projects(self):
         """
         Get projects
+
+        The list is cached for cache_ttl seconds; do not modify it.
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.get(f"{self.url}/projects", headers=self.headers, verify=False)
+        cached = self.cache.get(("projects",))
+        if cached is not None:
+            return cached
+        r = self._request("GET", "/projects")
         if not r.ok:
             raise Exception(f"Error getting projects: {self._parse_error(r)}")
-        return r.json()["projects"]
+        projects = r.json()["projects"]
+        self.cache.set(("projects",), projects)
+        return projects
 
     def get_projects_slugs(self):
         """
         Get projects slugs
         """
-        if not self.headers:
-            raise Exception("No token found")
-        r = requests.get(f"{self.url}/projects", headers=self.headers, verify=False)
-        if not r.ok:
-            raise Exception(f"Error getting projects: {self._parse_error(r)}")
-        return [i["parameters"]["project_slug"] for i in r.json()["projects"]]
+        return [i["parameters"]["project_slug"] for i in self.get_projects()]
 
     def add_project(
         self,
@@ -172,6 +719,13 @@ class AtApi:
         seed: int = 42,
         from_project: str | None = None,
         from_toy_dataset: bool = False,
+        upload_format: str = "csv",
+        chunksize: int | None = None,
+        compress: bool = False,
+        progress: Callable[[dict], None] | None = None,
+        validate: bool = True,
+        minimize: bool = True,
+        normalize_whitespace: bool = False,
     ):
         """
         Create a new project
@@ -205,35 +759,88 @@ class AtApi:
             seed: random seed
             from_project: slug of an existing project to copy data from
             from_toy_dataset: whether to use a toy dataset
+            upload_format: "csv" or "parquet" (falls back to csv if refused)
+            chunksize: stream the CSV upload by chunks of this many rows
+            compress: gzip the CSV upload
+            progress: called during a streamed upload with bytes sent and throughput
+            validate: check ids, texts, labels and split sizes before the upload,
+                raise DatasetValidationError with the report if an issue is found
+            minimize: upload only the columns above, label and stratify columns
+                as categories, and print the payload size before and after
+            normalize_whitespace: collapse runs of whitespace in the texts (with minimize)
+
+        With a dataset_registry, a dataset already uploaded to this server is
+        not sent again: the project is created from_project.
         """
 
         if not self.headers:
             raise Exception("No token found")
 
         # test if the elements exist
-        if col_id not in data.columns:
-            raise Exception(f"Column {col_id} not found in data")
-        for col_text in cols_text:
-            if col_text not in data.columns:
-                raise Exception(f"Column {col_text} not found in data")
-        for col_context in cols_context:
-            if col_context not in data.columns:
-                raise Exception(f"Column {col_context} not found in data")
-        for col_label in cols_label:
-            if col_label not in data.columns:
-                raise Exception(f"Column {col_label} not found in data")
-
-        # send the file
-        csv_string = data.to_csv(index=False)
-        r = requests.post(
-            f"{self.url}/files/add/project",
-            params={"project_name": project_name},
-            files={"file": (filename, csv_string)},
-            verify=False,
-            headers=self.headers,
-        )
-        if not r.ok:
-            raise Exception(f"Error uploading file: {self._parse_error(r)}")
+        columns = [col_id, *cols_text, *cols_context, *cols_label, *cols_stratify]
+        check_columns(data, columns)
+
+        # fail before sending the file rather than after the upload
+        if validate:
+            check_dataset(
+                data,
+                col_id=col_id,
+                cols_text=cols_text,
+                cols_label=cols_label,
+                n_train=n_train,
+                n_test=n_test,
+                n_valid=n_valid,
+                n_skip=n_skip,
+                n_total=n_total,
+            )
+
+        # reuse a project created from the same data on this server
+        dataset_hash, reused = None, False
+        if self.dataset_registry and from_project is None and not from_toy_dataset:
+            dataset_hash = fingerprint(
+                data,
+                columns if minimize else list(data.columns),
+                params={"normalize_whitespace": minimize and normalize_whitespace},
+            )
+            entry = self.dataset_registry.get(self.url, dataset_hash)
+            if entry is not None and entry["project_slug"] in self.get_projects_slugs():
+                print(f"Dataset already uploaded with project {entry['project_slug']}, reusing it")
+                from_project, reused = entry["project_slug"], True
+            elif entry is not None and self.dataset_registry.is_pending(entry):
+                # the project is still being created: upload, but keep it registered
+                dataset_hash = None
+
+        if not reused:
+            # send only what the server reads
+            original = data
+            if minimize:
+                data = minimize_frame(
+                    data,
+                    columns,
+                    categorical=[*cols_label, *cols_stratify] if upload_format == "parquet" else [],
+                    texts=cols_text if normalize_whitespace else [],
+                )
+
+            # send the file
+            filename, size, sent_format = self._upload_dataset(
+                project_name,
+                data,
+                filename,
+                upload_format=upload_format,
+                chunksize=chunksize,
+                compress=compress,
+                progress=progress,
+            )
+            if minimize:
+                # the full frame in the format sent, parquet may fall back to csv
+                size_before = estimate_payload(
+                    original, sent_format, compress=compress and sent_format == "csv"
+                )
+                saved = 1 - size / size_before if size_before else 0.0
+                print(
+                    f"Upload payload: {format_size(size_before)} -> {format_size(size)}"
+                    f" ({saved:.0%} smaller)"
+                )
 
         # create the project
         form = {
@@ -266,13 +873,87 @@ class AtApi:
             "from_toy_dataset": from_toy_dataset,
         }
 
-        r = requests.post(
-            f"{self.url}/projects/new", json=form, headers=self.headers, verify=False
-        )
+        r = self._request("POST", "/projects/new", json=form)
+        self.cache.invalidate(("projects",))
         if not r.ok:
             raise Exception(f"Error creating project: {self._parse_error(r)}")
+        if dataset_hash is not None and not reused:
+            self.dataset_registry.add(self.url, dataset_hash, r.json())
         return r.json()
 
+    def _upload_dataset(
+        self,
+        project_name: str,
+        data: pd.DataFrame,
+        filename: str,
+        upload_format: str = "csv",
+        chunksize: int | None = None,
+        compress: bool = False,
+        progress: Callable[[dict], None] | None = None,
+    ) -> tuple[str, int, str]:
+        """
+        Upload the dataset of a new project, return the uploaded filename,
+        the size of the file sent and its format (csv after a parquet refusal)
+        """
+        if upload_format not in ("csv", "parquet"):
+            raise Exception(f"Unknown upload format {upload_format}")
+
+        if upload_format == "parquet":
+            buffer = io.BytesIO()
+            data.to_parquet(buffer, index=False, compression="zstd")
+            parquet_filename = str(Path(filename).with_suffix(".parquet"))
+            r = self._request(
+                "POST",
+                "/files/add/project",
+                params={"project_name": project_name},
+                files={
+                    "file": (
+                        parquet_filename,
+                        buffer.getvalue(),
+                        "application/vnd.apache.parquet",
+                    )
+                },
+            )
+            if r.ok:
+                return parquet_filename, buffer.tell(), "parquet"
+            if r.status_code not in (400, 415, 422):
+                raise Exception(f"Error uploading file: {self._parse_error(r)}")
+            print(f"Parquet upload refused, falling back to csv: {self._parse_error(r)}")
+
+        # csv, either streamed by chunks of rows or in one piece
+        if chunksize:
+            body = MultipartCsvStream(
+                data,
+                filename=filename,
+                chunksize=chunksize,
+                compress=compress,
+                progress=progress,
+            )
+            filename = body.filename
+            r = self._request(
+                "POST",
+                "/files/add/project",
+                params={"project_name": project_name},
+                data=body,
+                headers={"Content-Type": body.content_type},
+            )
+            size = body.file_bytes
+        else:
+            payload = data.to_csv(index=False).encode("utf-8")
+            if compress:
+                payload = gzip.compress(payload, compresslevel=6)
+                filename = f"{filename}.gz"
+            r = self._request(
+                "POST",
+                "/files/add/project",
+                params={"project_name": project_name},
+                files={"file": (filename, payload)},
+            )
+            size = len(payload)
+        if not r.ok:
+            raise Exception(f"Error uploading file: {self._parse_error(r)}")
+        return filename, size, "csv"
+
     def delete_project(self, project_slug: str):
         """
         Delete a project
@@ -280,15 +961,17 @@ class AtApi:
         if not self.headers:
             raise Exception("No token found")
 
-        r = requests.post(
-            f"{self.url}/projects/delete",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/projects/delete",
             params={"project_slug": project_slug},
         )
+        self.cache.invalidate(("projects",), ("state", project_slug))
         if not r.ok:
             print(f"Error deleting project: {self._parse_error(r)}")
         else:
+            if self.dataset_registry:
+                self.dataset_registry.remove(self.url, project_slug)
             print("Project deleted")
 
     def get_users(self):
@@ -297,7 +980,7 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.get(f"{self.url}/users", headers=self.headers, verify=False)
+        r = self._request("GET", "/users")
         if not r.ok:
             raise Exception(f"Error getting users: {self._parse_error(r)}")
         return r.json()
@@ -311,32 +994,148 @@ class AtApi:
         if not self.headers:
             raise Exception("No token found")
 
-        r = requests.post(
-            f"{self.url}/users/create",
+        r = self._request(
+            "POST",
+            "/users/create",
             json={
                 "username": username,
                 "password": password,
                 "contact": mail,
                 "status": status,
             },
-            headers=self.headers,
-            verify=False,
         )
         if not r.ok:
             print(f"Error creating user: {self._parse_error(r)}")
         else:
             print("User created")
 
+    def add_users_bulk(
+        self, users: pd.DataFrame, max_workers: int = 16, status: str = "manager"
+    ) -> pd.DataFrame:
+        """
+        Create many users concurrently
+
+        Users already existing on the server, or repeated in the table, are
+        skipped instead of being created again.
+
+        Args:
+            users: table with username, password, mail (or contact) columns
+                and optionally a status column
+            max_workers: number of requests in flight
+            status: status of users without a status column
+
+        Returns a DataFrame with one row per input row: username, result
+        ("created", "skipped" or "failed"), error and latency_ms
+        """
+        if not self.headers:
+            raise Exception("No token found")
+        mail_column = "mail" if "mail" in users.columns else "contact"
+        check_columns(users, ["username", "password", mail_column])
+        existing = set(self.get_users())
+
+        def create(row: dict) -> dict:
+            def request():
+                return self._request(
+                    "POST",
+                    "/users/create",
+                    json={
+                        "username": row["username"],
+                        "password": row["password"],
+                        "contact": row[mail_column],
+                        "status": cell_or(row.get("status"), status),
+                    },
+                )
+
+            return bulk_call(row["username"] in existing, request, self._parse_error)
+
+        rows = users.to_dict("records")
+        seen: set[str] = set()
+        duplicates = []
+        for row in rows:
+            duplicates.append(row["username"] in seen)
+            seen.add(row["username"])
+        results = run_bulk(create, rows, duplicates, max_workers)
+        return pd.DataFrame(
+            [{"username": row["username"], **res} for row, res in zip(rows, results)]
+        )
+
+    def grant_project_access_bulk(
+        self, pairs, max_workers: int = 16, auth: str = "manager"
+    ) -> pd.DataFrame:
+        """
+        Grant users access to projects concurrently
+
+        Users who already have access to the project (read once from the
+        state of each project), or pairs repeated in the input, are skipped.
+
+        Args:
+            pairs: (username, project_slug) or (username, project_slug, auth)
+                tuples, or a table with username, project_slug and optionally
+                auth columns
+            max_workers: number of requests in flight
+            auth: status of the grants without an explicit one
+
+        Returns a DataFrame with one row per pair: username, project_slug,
+        result ("created", "skipped" or "failed"), error and latency_ms
+        """
+        if not self.headers:
+            raise Exception("No token found")
+        if isinstance(pairs, pd.DataFrame):
+            check_columns(pairs, ["username", "project_slug"])
+            rows = pairs.to_dict("records")
+        else:
+            rows = [
+                {"username": p[0], "project_slug": p[1], "auth": p[2] if len(p) > 2 else None}
+                for p in pairs
+            ]
+
+        def grant(row: dict) -> dict:
+            def request():
+                r = self._request(
+                    "POST",
+                    "/users/auth/add",
+                    json={
+                        "project_slug": row["project_slug"],
+                        "username": row["username"],
+                        "status": cell_or(row.get("auth"), auth),
+                    },
+                )
+                self.cache.invalidate(("projects",), ("state", row["project_slug"]))
+                return r
+
+            exists = row["username"] in granted.get(row["project_slug"], ())
+            return bulk_call(exists, request, self._parse_error)
+
+        granted: dict[str, set] = {}
+        for project_slug in {row["project_slug"] for row in rows}:
+            self.cache.invalidate(("state", project_slug))
+            try:
+                granted[project_slug] = users_from_state(self.get_project_state(project_slug))
+            except Exception:
+                pass  # the grants report the error of the server
+        seen: set[tuple[str, str]] = set()
+        duplicates = []
+        for row in rows:
+            key = (row["username"], row["project_slug"])
+            duplicates.append(key in seen)
+            seen.add(key)
+        results = run_bulk(grant, rows, duplicates, max_workers)
+        return pd.DataFrame(
+            [
+                {"username": row["username"], "project_slug": row["project_slug"], **res}
+                for row, res in zip(rows, results)
+            ]
+        )
+
     def delete_user(self, username: str) -> None:
         """
         Delete a user
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.post(
-            f"{self.url}/users/delete",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/users/delete",
             params={"user_to_delete": username},
         )
         if not r.ok:
@@ -350,32 +1149,49 @@ class AtApi:
         scheme: str,
         dataset: str = "train",
         verbose: bool = False,
+        chunksize: int | None = None,
+        return_type: str = "pandas",
     ):
         """
         Get current annotations for a projet/scheme
+
+        The response is parsed while it is downloaded, with string ids and
+        texts and categorical labels. With chunksize, an iterator of
+        DataFrames of chunksize rows is returned instead, for exports too
+        large to hold in memory: the connection is held until it is exhausted
+        or closed (call close() or use it in a with block to stop early).
+
+        return_type selects the result: "pandas" (DataFrame), "arrow"
+        (pyarrow Table parsed from the stream, without pandas), "records"
+        (list of dicts) or "raw" (csv bytes as sent by the server).
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.get(
-            f"{self.url}/export/data",
+        check_return_type(return_type)
+        if chunksize and return_type != "pandas":
+            raise ValueError("chunksize requires return_type='pandas'")
+        r = self._request(
+            "GET",
+            "/export/data",
             params={
                 "project_slug": project_slug,
                 "scheme": scheme,
                 "dataset": dataset,
                 "format": "csv",
             },
-            headers=self.headers,
-            verify=False,
+            stream=True,
         )
         if not r.ok:
             if verbose:
                 print(f"Error getting annotations: {self._parse_error(r)}")
+            r.close()
             return None
+        r.raw.decode_content = True
+        if chunksize:
+            return iter_csv_chunks(r, chunksize, ANNOTATION_DTYPES)
         try:
-            csv_decoded = r.content.decode("utf-8")
-            csv_io = io.StringIO(csv_decoded)
-            t = pd.read_csv(csv_io)
-            if len(t) == 0:
+            t = read_csv_as(r.raw, return_type, ANNOTATION_DTYPES)
+            if count_rows(t) == 0:
                 if verbose:
                     print(f"No {dataset} annotations found for {project_slug}/{scheme}")
                 return None
@@ -384,6 +1200,8 @@ class AtApi:
             if verbose:
                 print(f"Error parsing annotations: {e}")
             return None
+        finally:
+            r.close()
 
     def add_auth_user_project(
         self, username: str, project_slug: str, auth: str = "manager"
@@ -393,12 +1211,12 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.post(
-            f"{self.url}/users/auth/add",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/users/auth/add",
             json={"project_slug": project_slug, "username": username, "status": auth},
         )
+        self.cache.invalidate(("projects",), ("state", project_slug))
         if not r.ok:
             print(f"Error adding user auth: {self._parse_error(r)}")
         else:
@@ -410,12 +1228,12 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.post(
-            f"{self.url}/users/auth/delete",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/users/auth/delete",
             json={"project_slug": project_slug, "username": username},
         )
+        self.cache.invalidate(("projects",), ("state", project_slug))
         if not r.ok:
             print(f"Error deleting user auth: {self._parse_error(r)}")
         else:
@@ -427,10 +1245,9 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.get(
-            f"{self.url}/features/available",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "GET",
+            "/features/available",
             params={"project_slug": project_slug},
         )
         if not r.ok:
@@ -449,10 +1266,9 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.post(
-            f"{self.url}/features/add",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/features/add",
             params={"project_slug": project_slug},
             json={
                 "name": feature_name,
@@ -460,37 +1276,164 @@ class AtApi:
                 "parameters": feature_parameters,
             },
         )
+        self.cache.invalidate(("state", project_slug))
         if not r.ok:
             print(f"Error adding feature: {self._parse_error(r)}")
         else:
             print("Feature in training")
 
     def get_features_data(
-        self, project_slug: str, features: list[str], format: str = "csv"
+        self,
+        project_slug: str,
+        features: list[str],
+        format: str = "csv",
+        return_type: str = "pandas",
     ):
         """
         Get features from a project
+
+        return_type selects the result: "pandas" (DataFrame), "arrow"
+        (pyarrow Table), "records" (list of dicts) or "raw" (the file as sent
+        by the server, in format). Arrow and records results never build a
+        DataFrame.
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.get(
-            f"{self.url}/export/features",
+        check_return_type(return_type)
+        r = self._request(
+            "GET",
+            "/export/features",
             params={
                 "project_slug": project_slug,
                 "features": features,
                 "format": format,
             },
-            headers=self.headers,
-            verify=False,
+            stream=True,
         )
         if not r.ok:
             raise Exception(f"Error getting features data: {self._parse_error(r)}")
+        r.raw.decode_content = True
         try:
-            csv_decoded = r.content.decode("utf-8")
-            csv_io = io.StringIO(csv_decoded)
-            return pd.read_csv(csv_io)
+            if format == "csv":
+                if return_type == "pandas":
+                    return pd.read_csv(r.raw)
+                return read_csv_as(r.raw, return_type)
+            if return_type == "raw":
+                return r.raw.read()
+            import pyarrow as pa  # type: ignore[import]
+            import pyarrow.parquet as pq  # type: ignore[import]
+
+            content = pa.py_buffer(r.raw.read())
+            if format == "parquet":
+                table = pq.read_table(pa.BufferReader(content))
+            else:
+                try:
+                    table = pa.ipc.open_file(content).read_all()
+                except pa.ArrowInvalid:
+                    table = pa.ipc.open_stream(content).read_all()
+            if return_type == "arrow":
+                return table
+            return table.to_pylist() if return_type == "records" else table.to_pandas()
         except Exception as e:
             raise Exception(f"Error parsing features data: {e}")
+        finally:
+            r.close()
+
+    def get_features_matrix(
+        self,
+        project_slug: str,
+        features: list[str],
+        format: str = "parquet",
+        id_column: str = "id",
+        mmap_path: str | None = None,
+        batch_size: int = 65536,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get features from a project as a float32 matrix, without a DataFrame
+
+        The binary export (parquet or arrow) is streamed to a temporary file
+        and copied batch by batch into the matrix. With mmap_path, the matrix
+        is a memory-mapped .npy file written on disk.
+
+        Returns:
+            (ids, matrix): the row ids and the (n_rows, n_features) float32 matrix
+        """
+        import pyarrow as pa  # type: ignore[import]
+        import pyarrow.parquet as pq  # type: ignore[import]
+
+        if format not in ("parquet", "arrow"):
+            raise Exception(f"Unknown binary format {format}")
+        if not self.headers:
+            raise Exception("No token found")
+        r = self._request(
+            "GET",
+            "/export/features",
+            params={
+                "project_slug": project_slug,
+                "features": features,
+                "format": format,
+            },
+            stream=True,
+        )
+        if not r.ok:
+            raise Exception(f"Error getting features data: {self._parse_error(r)}")
+
+        folder = Path(mmap_path).parent if mmap_path else None
+        with tempfile.NamedTemporaryFile(suffix=f".{format}", dir=folder) as tmp:
+            try:
+                r.raw.decode_content = True
+                shutil.copyfileobj(r.raw, tmp, 1 << 20)
+                tmp.flush()
+            finally:
+                r.close()
+
+            try:
+                if format == "parquet":
+                    parquet = pq.ParquetFile(tmp.name)
+                    schema = parquet.schema_arrow
+                    n_rows = parquet.metadata.num_rows
+                    batches = parquet.iter_batches(batch_size=batch_size)
+                else:
+                    source = pa.memory_map(tmp.name)
+                    try:
+                        table = pa.ipc.open_file(source).read_all()
+                    except pa.ArrowInvalid:
+                        source.seek(0)
+                        table = pa.ipc.open_stream(source).read_all()
+                    schema = table.schema
+                    n_rows = table.num_rows
+                    batches = table.to_batches(max_chunksize=batch_size)
+            except Exception as e:
+                raise Exception(f"Error parsing features data: {e}")
+
+            # the id is either a column or the index stored by pandas
+            if id_column not in schema.names:
+                index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+                id_column = next((c for c in index_columns if isinstance(c, str)), "")
+            columns = [c for c in schema.names if c != id_column]
+
+            shape = (n_rows, len(columns))
+            if mmap_path:
+                matrix = np.lib.format.open_memmap(
+                    mmap_path, mode="w+", dtype=np.float32, shape=shape
+                )
+            else:
+                matrix = np.empty(shape, dtype=np.float32)
+            ids = []
+            row = 0
+            for batch in batches:
+                for j, column in enumerate(columns):
+                    matrix[row : row + batch.num_rows, j] = batch.column(
+                        column
+                    ).to_numpy(zero_copy_only=False)
+                if id_column:
+                    ids.append(batch.column(id_column).to_numpy(zero_copy_only=False))
+                row += batch.num_rows
+
+        if isinstance(matrix, np.memmap):
+            matrix.flush()
+        ids_array = np.concatenate(ids) if ids else np.arange(n_rows)
+        return ids_array, matrix
 
     def get_schemes(self, project_slug: str):
         """
@@ -498,11 +1441,7 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = self.get_project_state(project_slug)
-        if "schemes" in r:
-            return r["schemes"]["available"]
-        else:
-            raise Exception(f"No schemes found for project {project_slug}")
+        return schemes_from_state(self.get_project_state(project_slug), project_slug)
 
     def add_scheme_to_project(
         self,
@@ -516,10 +1455,9 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.post(
-            f"{self.url}/schemes/add",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/schemes/add",
             params={"project_slug": project_slug},
             json={
                 "project_slug": project_slug,
@@ -528,6 +1466,7 @@ class AtApi:
                 "labels": labels,
             },
         )
+        self.cache.invalidate(("state", project_slug))
         if not r.ok:
             print(f"Error adding scheme: {self._parse_error(r)}")
         else:
@@ -539,11 +1478,10 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.post(
-            f"{self.url}/schemes/delete",
-            headers=self.headers,
+        r = self._request(
+            "POST",
+            "/schemes/delete",
             params={"project_slug": project_slug},
-            verify=False,
             json={
                 "project_slug": project_slug,
                 "name": scheme,
@@ -551,6 +1489,7 @@ class AtApi:
                 "labels": [],
             },
         )
+        self.cache.invalidate(("state", project_slug))
         if not r.ok:
             print(f"Error deleting scheme: {self._parse_error(r)}")
         else:
@@ -562,12 +1501,12 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.post(
-            f"{self.url}/schemes/label/add",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/schemes/label/add",
             params={"project_slug": project_slug, "scheme": scheme, "label": label},
         )
+        self.cache.invalidate(("state", project_slug))
         if not r.ok:
             print(f"Error adding label: {self._parse_error(r)}")
         else:
@@ -579,103 +1518,326 @@ class AtApi:
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.post(
-            f"{self.url}/schemes/label/delete",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/schemes/label/delete",
             params={"project_slug": project_slug, "scheme": scheme, "label": label},
         )
+        self.cache.invalidate(("state", project_slug))
         if not r.ok:
             print(f"Error deleting label: {self._parse_error(r)}")
         else:
             print("Label deleted from scheme")
 
-    def download_raw_dataset(self, project_slug: str, folder: str = "./"):
+    def download_raw_dataset(
+        self,
+        project_slug: str,
+        folder: str = "./",
+        segments: int = 4,
+        checksum: str | None = None,
+        progress: Callable[[dict], None] | None = None,
+    ) -> dict:
         """
         Download raw dataset
+
+        The file is fetched in parallel Range segments with the session and
+        auth headers of the client; an interrupted download leaves a `.part`
+        file which is resumed by the next call. Size and, if given, the
+        sha256 checksum are verified.
+
+        Returns the statistics of download_file (bytes, seconds,
+        throughput_mb_s, sha256...)
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.get(
-            f"{self.url}/export/raw",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "GET",
+            "/export/raw",
             params={"project_slug": project_slug},
         )
         if not r.ok:
             raise Exception(f"Error downloading raw dataset: {self._parse_error(r)}")
         try:
             data = r.json()
-            response = requests.get(
-                f"{self.url}/{data['path']}", stream=True, verify=False
+            return download_file(
+                lambda method, **kwargs: self._request(
+                    method, "/{path}", path_params=data, **kwargs
+                ),
+                Path(folder) / data["name"],
+                segments=segments,
+                checksum=checksum,
+                progress=progress,
             )
-            if not response.ok:
-                raise Exception(f"Error fetching file: {self._parse_error(response)}")
-            with open(f"{folder}/{data['name']}", "wb") as out_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    out_file.write(chunk)
         except Exception as e:
             raise Exception(f"Error downloading raw dataset: {e}")
 
     def export_project(
-        self, project_slug: str, path: str = "./exports", raw_datasets: bool = False
-    ):
+        self,
+        project_slug: str,
+        path: str = "./exports",
+        raw_datasets: bool = False,
+        verbose: bool = True,
+        max_concurrency: int = 4,
+        incremental: bool = False,
+        manifest: ExportManifest | None = None,
+    ) -> dict:
         """
         Save a project
         for each scheme :
             - save train/test/valid annotations
+
+        Annotations of the scheme/dataset pairs are downloaded by up to
+        max_concurrency parallel requests.
+
+        Annotations only go to disk: the csv sent by the server is written
+        as is, without being parsed.
+
+        With incremental, an existing export is updated in place: only the
+        files whose content changed since the last export recorded in the
+        manifest of `path` are rewritten (see _export_project_incremental).
+
+        The export is written in a temporary folder renamed to
+        `path/project_slug` once complete, so an interrupted export never
+        leaves a partial project folder behind. The raw dataset is downloaded
+        in `path/.project_slug.raw` and moved into the export once complete:
+        an interrupted download is kept there and resumed by the next export.
+
+        Returns a dict with:
+            - project_slug (str)
+            - status (str): "success" or "skipped" if already saved
+              ("updated" or "unchanged" when incremental)
+            - schemes (int): number of schemes exported
+            - files (int): number of files written
+            - bytes (int): total size of the files written
         """
         if not self.headers:
             raise Exception("No token found")
 
-        print(f"Starting the export of project {project_slug}")
+        if incremental:
+            save_manifest = manifest is None
+            manifest = manifest or ExportManifest(path)
+            result = self._export_project_incremental(
+                project_slug,
+                path,
+                manifest,
+                raw_datasets,
+                max_concurrency,
+            )
+            if save_manifest:
+                manifest.save()
+            return result
+
+        result = {
+            "project_slug": project_slug,
+            "status": "skipped",
+            "schemes": 0,
+            "files": 0,
+            "bytes": 0,
+        }
+
+        if verbose:
+            print(f"Starting the export of project {project_slug}")
 
         # create folder
-        if Path(f"{path}/{project_slug}").exists():
-            print(
-                "This project seems already be saved, check or delete the previous version"
-            )
-            return None
+        path_final = Path(path) / project_slug
+        if path_final.exists():
+            if verbose:
+                print(
+                    "This project seems already be saved, check or delete the previous version"
+                )
+            return result
 
-        # create the folder
-        os.makedirs(f"{path}/{project_slug}")
-        path_project = f"{path}/{project_slug}"
+        # create a temporary folder next to the final one
+        os.makedirs(path, exist_ok=True)
+        path_project = tempfile.mkdtemp(prefix=f".{project_slug}.", dir=path)
+        try:
+            # get the state of the project to save it
+            state = self.get_project_state(project_slug)
+            with open(f"{path_project}/{project_slug}.json", "w") as f:
+                json.dump(state, f)
+
+            # get schemes annotation for each scheme, downloads run concurrently
+            # and each file is written as soon as its download completes
+            schemes = schemes_from_state(state, project_slug)
+            with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+                futures = {
+                    executor.submit(
+                        self.get_annotations_data,
+                        project_slug,
+                        scheme,
+                        dataset,
+                        return_type="raw",
+                    ): (scheme, dataset)
+                    for scheme in schemes
+                    for dataset in ["train", "test", "valid"]
+                }
+                for future in as_completed(futures):
+                    scheme, dataset = futures[future]
+                    t = future.result()
+                    if t is not None:
+                        with open(
+                            f"{path_project}/annotations-scheme-{scheme}-{dataset}.csv",
+                            "wb",
+                        ) as f:
+                            f.write(t)
 
-        # get the state of the project to save it
+            if verbose:
+                print(f"Project {project_slug} saved with {len(schemes)} schemes")
+
+            # if requested, export raw dataset, through a stable folder
+            # keeping the partial download if the export fails
+            if raw_datasets:
+                path_raw = Path(path) / f".{project_slug}.raw"
+                path_raw.mkdir(exist_ok=True)
+                raw = Path(self.download_raw_dataset(project_slug, str(path_raw))["path"])
+                os.replace(raw, Path(path_project) / raw.name)
+                path_raw.rmdir()
+                if verbose:
+                    print("Raw dataset downloaded")
+
+            sizes = [f.stat().st_size for f in Path(path_project).iterdir()]
+            os.rename(path_project, path_final)
+        except BaseException:
+            shutil.rmtree(path_project, ignore_errors=True)
+            raise
+
+        result.update(
+            status="success",
+            schemes=len(schemes),
+            files=len(sizes),
+            bytes=sum(sizes),
+        )
+        return result
+
+    def _export_project_incremental(
+        self,
+        project_slug: str,
+        path: str,
+        manifest: ExportManifest,
+        raw_datasets: bool = False,
+        max_concurrency: int = 4,
+        last_activity: str | None = None,
+    ) -> dict:
+        """
+        Update the export of a project in place and record it in the manifest
+
+        The state file is rewritten only if the state hash changed, and each
+        annotation file only if its content hash changed. Files of schemes
+        deleted from the project are removed.
+        """
+        path_project = Path(path) / project_slug
+        path_project.mkdir(parents=True, exist_ok=True)
+        entry = manifest.get(project_slug) or {}
+        files: dict[str, str] = entry.get("files", {})
+        written: list[int] = []
+
+        def write(name: str, content: bytes) -> None:
+            digest = hash_bytes(content)
+            if files.get(name) != digest or not (path_project / name).exists():
+                write_atomic(path_project / name, content)
+                files[name] = digest
+                written.append(len(content))
+
+        # state of the project
         state = self.get_project_state(project_slug)
-        with open(f"{path_project}/{project_slug}.json", "w") as f:
-            json.dump(state, f)
-
-        # get schemes annotation for each scheme
-        schemes = self.get_schemes(project_slug)
-        for scheme in schemes:
-            for dataset in ["train", "test", "valid"]:
-                t = self.get_annotations_data(project_slug, scheme, dataset)
+        state_hash = hash_state(state)
+        if state_hash != entry.get("state_hash") or f"{project_slug}.json" not in files:
+            write(f"{project_slug}.json", json.dumps(state).encode("utf-8"))
+
+        # annotations, written only when their content changed
+        schemes = schemes_from_state(state, project_slug)
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            futures = {
+                executor.submit(
+                    self.get_annotations_data,
+                    project_slug,
+                    scheme,
+                    dataset,
+                    return_type="raw",
+                ): (scheme, dataset)
+                for scheme in schemes
+                for dataset in ["train", "test", "valid"]
+            }
+            for future in as_completed(futures):
+                scheme, dataset = futures[future]
+                t = future.result()
                 if t is not None:
-                    t.to_csv(
-                        f"{path_project}/annotations-scheme-{scheme}-{dataset}.csv"
-                    )
+                    write(f"annotations-scheme-{scheme}-{dataset}.csv", t)
 
-        print(f"Project {project_slug} saved with {len(schemes)} schemes")
+        # drop the files of deleted schemes
+        current = {
+            f"annotations-scheme-{scheme}-{dataset}.csv"
+            for scheme in schemes
+            for dataset in ["train", "test", "valid"]
+        }
+        for name in list(files):
+            if name.startswith("annotations-scheme-") and name not in current:
+                (path_project / name).unlink(missing_ok=True)
+                del files[name]
 
-        # if requested, export raw dataset
-        if raw_datasets:
-            self.download_raw_dataset(project_slug, path_project)
-            print("Raw dataset downloaded")
+        # the raw dataset does not change once the project is created
+        if raw_datasets and not entry.get("raw_dataset"):
+            self.download_raw_dataset(project_slug, str(path_project))
+            entry["raw_dataset"] = True
 
-        return None
+        if last_activity is None:
+            last_activity = next(
+                (
+                    p.get("last_activity")
+                    for p in self.get_projects()
+                    if p.get("project_slug") == project_slug
+                ),
+                None,
+            )
+        manifest.update(
+            project_slug,
+            {
+                "last_activity": last_activity,
+                "state_hash": state_hash,
+                "files": files,
+                "raw_dataset": entry.get("raw_dataset", False),
+            },
+        )
+        return {
+            "project_slug": project_slug,
+            "status": "updated" if written else "unchanged",
+            "schemes": len(schemes),
+            "files": len(written),
+            "bytes": sum(written),
+        }
 
     def export_all(
         self,
         path: str = "./exports",
         raw_datasets: bool = False,
         since: datetime | None = None,
-    ):
+        max_workers: int = 1,
+        max_concurrency: int = 4,
+        progress: Callable[[dict], None] | None = None,
+        incremental: bool = False,
+    ) -> dict:
         """
         Save all the data
 
-        Filter from the last activity
+        Filter from the last activity. Projects are exported concurrently by
+        max_workers threads sharing the connection pool of the client, each
+        with up to max_concurrency annotation downloads in flight, and
+        progress (if given) is called with each project result as it ends.
+
+        With incremental, the exports are updated in place from the manifest
+        of `path`: projects whose last_activity did not change are not
+        requested at all, and only changed files of the others are rewritten.
+
+        Returns a dict with:
+            - projects (list[dict]): per-project result of export_project,
+              with an error message and the elapsed seconds
+            - success / skipped / error (int): number of projects per status
+              (updated / unchanged when incremental)
+            - bytes (int): total size written
+            - seconds (float): total elapsed time
         """
+        start = time.monotonic()
+
         # get project summary
         projects = self.get_projects()
 
@@ -687,9 +1849,72 @@ class AtApi:
                 if pd.to_datetime(project["last_activity"]) >= since
             ]
 
+        manifest = ExportManifest(path) if incremental else None
+
+        def export(project: dict) -> dict:
+            project_slug = project["project_slug"]
+            t0 = time.monotonic()
+            try:
+                if manifest is not None:
+                    entry = manifest.get(project_slug)
+                    if (
+                        entry is not None
+                        and entry["last_activity"] == project.get("last_activity")
+                        and (Path(path) / project_slug).is_dir()
+                    ):
+                        result = {
+                            "project_slug": project_slug,
+                            "status": "unchanged",
+                            "schemes": 0,
+                            "files": 0,
+                            "bytes": 0,
+                        }
+                    else:
+                        result = self._export_project_incremental(
+                            project_slug,
+                            path,
+                            manifest,
+                            raw_datasets,
+                            max_concurrency,
+                            last_activity=project.get("last_activity"),
+                        )
+                        manifest.save()
+                else:
+                    result = self.export_project(
+                        project_slug,
+                        path,
+                        raw_datasets,
+                        verbose=False,
+                        max_concurrency=max_concurrency,
+                    )
+                result["error"] = None
+            except Exception as e:
+                result = {
+                    "project_slug": project_slug,
+                    "status": "error",
+                    "schemes": 0,
+                    "files": 0,
+                    "bytes": 0,
+                    "error": str(e),
+                }
+            result["seconds"] = round(time.monotonic() - t0, 3)
+            return result
+
         # save each project
-        for project in projects:
-            self.export_project(project["project_slug"], path, raw_datasets)
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for future in as_completed([executor.submit(export, p) for p in projects]):
+                results.append(future.result())
+                if progress is not None:
+                    progress(results[-1])
+
+        statuses = ["updated", "unchanged"] if incremental else ["success", "skipped"]
+        summary: dict = {"projects": results, **{k: 0 for k in statuses}, "error": 0}
+        for result in results:
+            summary[result["status"]] += 1
+        summary["bytes"] = sum(result["bytes"] for result in results)
+        summary["seconds"] = round(time.monotonic() - start, 3)
+        return summary
 
     def get_models(self, project_slug: str) -> dict:
         """
@@ -701,18 +1926,36 @@ class AtApi:
             "training": r["bertmodels"]["training"],
         }
 
+    def watch(
+        self,
+        project_slugs: List[str],
+        callback: Callable[[ProjectEvent], None],
+        interval: float = 5.0,
+    ) -> Watcher:
+        """
+        Watch projects and call callback with each change detected
+
+        The events (scheme/label added or removed, training started or
+        finished, model available, last_activity changed) are computed in a
+        background thread from successive snapshots of the project states.
+        Call stop() on the returned Watcher to end it.
+        """
+        if not self.headers:
+            raise Exception("No token found")
+        return Watcher(self, project_slugs, callback, interval).start()
+
     def stop_finetune_model(self, project_slug: str):
         """
         Stop training a model
         """
         if not self.headers:
             raise Exception("No token found")
-        r = requests.post(
-            f"{self.url}/stop",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/stop",
             params={"project_slug": project_slug},
         )
+        self.cache.invalidate(("state", project_slug))
         if not r.ok:
             print(f"Error stopping model: {self._parse_error(r)}")
         else:
@@ -761,13 +2004,13 @@ class AtApi:
             "class_balance": class_balance,
         }
 
-        r = requests.post(
-            f"{self.url}/models/bert/train",
-            headers=self.headers,
-            verify=False,
+        r = self._request(
+            "POST",
+            "/models/bert/train",
             params={"project_slug": project_slug},
             json=payload,
         )
+        self.cache.invalidate(("state", project_slug))
         if not r.ok:
             print(f"Error starting model training: {self._parse_error(r)}")
         else:
@@ -0,0 +1,169 @@
+"""
+Local registry of the datasets already uploaded, by content.
+
+add_project fingerprints the columns it would upload and looks the hash up
+here: if a project of the same server was created from the same data, the
+new project is created with from_project instead of uploading the file again.
+The fingerprint reads the column buffers by chunks of rows (string lengths
+and bytes from pyarrow, raw values of numeric columns) into one hash, so it
+costs a fraction of the csv serialisation it saves.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List
+
+from .lazy import lazy_import
+from .manifest import write_atomic
+from .tokens import file_lock
+
+if TYPE_CHECKING:
+    import numpy as np  # type: ignore[import]
+    import pandas as pd  # type: ignore[import]
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+DEFAULT_PATH = Path.home() / ".cache" / "atclient" / "datasets.json"
+
+# rows hashed at once
+CHUNKSIZE = 1_000_000
+
+# seconds a registered project may stay unlisted while it is being created
+PENDING_TIME = 600.0
+
+
+def _string_parts(values: pd.Series) -> list[bytes] | None:
+    """Lengths, bytes and nulls of a chunk of strings, None if not strings."""
+    try:
+        import pyarrow as pa  # type: ignore[import]
+
+        array = pa.array(values, type=pa.large_string(), from_pandas=True)
+    except Exception:
+        return None
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    _, offsets_buffer, data = array.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int64)[
+        array.offset : array.offset + len(array) + 1
+    ]
+    parts = [
+        np.diff(offsets).tobytes(),
+        memoryview(data)[offsets[0] : offsets[-1]] if data is not None else b"",
+    ]
+    if array.null_count:
+        parts.append(array.is_null().to_numpy(zero_copy_only=False).tobytes())
+    return parts
+
+
+def _column_parts(values: pd.Series, chunksize: int) -> Iterator[bytes]:
+    """Bytes identifying the values of a column, by chunks of rows."""
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        array = values.to_numpy()
+        for start in range(0, len(array), chunksize):
+            yield array[start : start + chunksize].tobytes()
+        return
+    strings = not isinstance(dtype, (np.dtype, pd.CategoricalDtype)) or dtype == object
+    for start in range(0, len(values), chunksize):
+        # converted chunk by chunk, so memory does not grow with the column
+        chunk = values.iloc[start : start + chunksize]
+        parts = _string_parts(chunk) if strings else None
+        if parts is not None:
+            yield from parts
+        else:
+            # mixed objects, categories of other types, extension types
+            yield pd.util.hash_pandas_object(chunk, index=False).to_numpy().tobytes()
+
+
+def fingerprint(
+    data: pd.DataFrame, columns: List[str], params: dict | None = None, chunksize: int = CHUNKSIZE
+) -> str:
+    """
+    Content hash of the columns of a DataFrame
+
+    Args:
+        data: DataFrame to upload
+        columns: columns hashed, in this order
+        params: parameters changing what is uploaded (column roles, options)
+        chunksize: number of rows hashed at once
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    header = {
+        "rows": len(data),
+        "columns": list(columns),
+        "params": params or {},
+    }
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode("utf-8"))
+    for col in columns:
+        digest.update(str(col).encode("utf-8"))
+        for part in _column_parts(data[col], chunksize):
+            digest.update(part)
+    return digest.hexdigest()
+
+
+class DatasetRegistry:
+    """
+    On-disk map of (server url, dataset fingerprint) to the project created
+    from it, safe to share between threads and processes
+
+    Args:
+        path: JSON file storing the registry (~/.cache/atclient/datasets.json by default)
+        pending_time: seconds a project not listed yet is kept, as still being created
+    """
+
+    def __init__(self, path: str | Path | None = None, pending_time: float = PENDING_TIME):
+        self.path = Path(path) if path else DEFAULT_PATH
+        self.pending_time = pending_time
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, fingerprint: str) -> str:
+        return f"{url.rstrip('/')}|{fingerprint}"
+
+    def _locked(self):
+        return file_lock(self.path, self._lock)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def get(self, url: str, fingerprint: str) -> dict | None:
+        """Entry (project_slug, created_at) of the project created from this dataset"""
+        with self._locked():
+            return self._read().get(self.key(url, fingerprint))
+
+    def is_pending(self, entry: dict) -> bool:
+        """Whether the project of an entry may still be being created"""
+        return time.time() - entry["created_at"] < self.pending_time
+
+    def add(self, url: str, fingerprint: str, project_slug: str) -> None:
+        """Record the project created from a dataset"""
+        with self._locked():
+            datasets = self._read()
+            datasets[self.key(url, fingerprint)] = {
+                "project_slug": project_slug,
+                "created_at": time.time(),
+            }
+            write_atomic(self.path, json.dumps(datasets, indent=1).encode("utf-8"))
+
+    def remove(self, url: str, project_slug: str) -> None:
+        """Forget a project, e.g. once deleted"""
+        prefix = self.key(url, "")
+        with self._locked():
+            datasets = self._read()
+            kept = {
+                k: v
+                for k, v in datasets.items()
+                if not (k.startswith(prefix) and v["project_slug"] == project_slug)
+            }
+            if len(kept) != len(datasets):
+                write_atomic(self.path, json.dumps(kept, indent=1).encode("utf-8"))
@@ -0,0 +1,201 @@
+"""
+Retry policy and circuit breaker applied to every AtApi request.
+
+Requests are retried with exponential backoff and jitter when the server
+answers with a transient status or the connection fails. Endpoints that
+are not idempotent are only retried when the request never reached the
+server. A circuit breaker per host fails fast while the server is down.
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests  # type: ignore[import]
+from urllib3.exceptions import NewConnectionError  # type: ignore[import]
+
+# POST endpoints safe to send twice (GET and HEAD always are)
+IDEMPOTENT_ENDPOINTS = {
+    "/token",
+    "/files/add/project",
+    "/projects/delete",
+    "/users/delete",
+    "/users/auth/delete",
+    "/schemes/delete",
+    "/schemes/label/delete",
+    "/stop",
+}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without sending the request while the circuit of a host is open."""
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a request
+
+    Args:
+        total: maximum number of retries of a request
+        backoff_factor: first backoff in seconds, doubled at each retry
+        max_backoff: maximum backoff in seconds
+        jitter: random fraction of the backoff added or removed
+        status_forcelist: statuses retried
+        respect_retry_after: wait for the Retry-After header when present
+        idempotent_endpoints: POST endpoint templates safe to retry
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: float = 0.5,
+        status_forcelist: tuple[int, ...] = (429, 502, 503, 504),
+        respect_retry_after: bool = True,
+        idempotent_endpoints: set[str] | None = None,
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = status_forcelist
+        self.respect_retry_after = respect_retry_after
+        self.idempotent_endpoints = (
+            IDEMPOTENT_ENDPOINTS if idempotent_endpoints is None else idempotent_endpoints
+        )
+
+    def is_idempotent(self, method: str, endpoint: str) -> bool:
+        return method.upper() in ("GET", "HEAD") or endpoint in self.idempotent_endpoints
+
+    def backoff(self, attempt: int, response: requests.Response | None = None) -> float:
+        """Seconds to wait before retry number attempt (from 0)"""
+        if self.respect_retry_after and response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.max_backoff)
+                except ValueError:
+                    try:
+                        delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                        return min(max(0.0, delay), self.max_backoff)
+                    except (TypeError, ValueError):
+                        pass
+        delay = min(self.backoff_factor * 2**attempt, self.max_backoff)
+        return max(0.0, delay * (1 + random.uniform(-self.jitter, self.jitter)))
+
+
+def never_sent(error: Exception) -> bool:
+    """Whether a request failed before reaching the server"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        reason = getattr(error.args[0], "reason", None)
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+class CircuitBreaker:
+    """
+    Closed while the host answers, open after failure_threshold consecutive
+    failures (connection errors, timeouts and retryable statuses). Once
+    reset_timeout elapsed, one trial request is let through (half-open): its
+    success closes the circuit, its failure reopens it. A trial released
+    without outcome, or still pending after reset_timeout, lets a new trial
+    through.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_at = 0.0
+        self.counters: Counter = Counter()
+
+    def before_request(self) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            now = time.monotonic()
+            if (self.state == "open" and now - self.opened_at >= self.reset_timeout) or (
+                self.state == "half-open" and now - self.trial_at >= self.reset_timeout
+            ):
+                self.state = "half-open"
+                self.trial_at = now
+                self.counters["half_opened"] += 1
+                return
+            self.counters["rejected"] += 1
+        raise CircuitOpenError("Circuit open: the server is failing, request not sent")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            if self.state != "closed":
+                self.state = "closed"
+                self.counters["closed"] += 1
+
+    def release_trial(self) -> None:
+        """End a request without outcome: a half-open trial is let through again."""
+        with self._lock:
+            if self.state == "half-open":
+                self.trial_at = float("-inf")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.counters["failures"] += 1
+            if self.state == "half-open" or (
+                self.state == "closed" and self.failures >= self.failure_threshold
+            ):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.counters["opened"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                **{k: self.counters[k] for k in ("failures", "opened", "half_opened", "closed", "rejected")},
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url: str, **kwargs) -> CircuitBreaker:
+    """Circuit breaker shared by all the clients of a host"""
+    host = urlsplit(url).netloc
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(**kwargs)
+        return _breakers[host]
+
+
+class RetryStats:
+    """Thread-safe retry counters by endpoint template"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries: Counter = Counter()
+        self.giveups: Counter = Counter()
+
+    def incr(self, name: str, endpoint: str) -> None:
+        with self._lock:
+            getattr(self, name)[endpoint] += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "retries": sum(self.retries.values()),
+                "giveups": sum(self.giveups.values()),
+                "retries_by_endpoint": dict(self.retries),
+                "giveups_by_endpoint": dict(self.giveups),
+            }
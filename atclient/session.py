@@ -0,0 +1,203 @@
+"""
+Pooled HTTP session used by the ActiveTigger client.
+
+Every AtApi call goes through one requests.Session mounted with a sized
+HTTPAdapter, so connections are kept alive and reused across calls instead
+of paying a new TCP/TLS handshake each time.
+"""
+
+import threading
+
+import requests  # type: ignore[import]
+import urllib3  # type: ignore[import]
+from requests.adapters import HTTPAdapter  # type: ignore[import]
+from urllib3.connectionpool import (  # type: ignore[import]
+    HTTPConnectionPool,
+    HTTPSConnectionPool,
+)
+from urllib3.exceptions import EmptyPoolError, InsecureRequestWarning  # type: ignore[import]
+
+# (connect, read) timeouts in seconds, by endpoint template
+DEFAULT_TIMEOUTS: dict[str, float | tuple[float, float]] = {
+    "default": (10, 120),
+    "/": 10,
+    "/token": (10, 30),
+    "/files/add/project": (10, 1800),
+    "/projects/new": (10, 600),
+    "/export/data": (10, 600),
+    "/export/features": (10, 1800),
+    "/export/raw": (10, 60),
+}
+
+# seconds a request waits for a free connection of a full blocking pool
+POOL_TIMEOUT = 60.0
+
+DEFAULT_HEADERS = {
+    "User-Agent": "atclient",
+    "Accept": "application/json, */*",
+    "Connection": "keep-alive",
+}
+
+
+class PoolTimeout(requests.exceptions.RequestException):
+    """
+    No connection of the pool was released within the pool timeout
+    """
+
+
+class PoolStats:
+    """
+    Thread-safe counters on the connection pools of an adapter
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.waiting = 0
+        self.waited = 0
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "connections_opened": self.opened,
+                "connections_reused": self.reused,
+                "requests_waiting": self.waiting,
+                "requests_waited": self.waited,
+            }
+
+
+class _CountingPoolMixin:
+    """
+    Count new/reused connections and checkouts blocked on an empty pool
+    """
+
+    stats: PoolStats
+    pool_timeout: float | None
+
+    def _get_conn(self, timeout=None):
+        if timeout is None:
+            # requests never passes a pool timeout to urllib3
+            timeout = self.pool_timeout
+        pool = self.pool  # type: ignore[attr-defined]
+        blocked = bool(self.block and pool is not None and pool.empty())  # type: ignore[attr-defined]
+        if blocked:
+            self.stats.incr("waiting")
+            self.stats.incr("waited")
+        try:
+            conn = super()._get_conn(timeout)  # type: ignore[misc]
+        finally:
+            if blocked:
+                self.stats.incr("waiting", -1)
+        if getattr(conn, "_atclient_fresh", False):
+            conn._atclient_fresh = False
+        else:
+            self.stats.incr("reused")
+        return conn
+
+    def _new_conn(self):
+        conn = super()._new_conn()  # type: ignore[misc]
+        conn._atclient_fresh = True
+        self.stats.incr("opened")
+        return conn
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connection pools report PoolStats, and raise
+    PoolTimeout after waiting pool_timeout seconds on a full blocking pool
+    """
+
+    def __init__(self, *args, pool_timeout: float | None = POOL_TIMEOUT, **kwargs):
+        self.stats = PoolStats()
+        self.pool_timeout = pool_timeout
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"stats": self.stats, "pool_timeout": self.pool_timeout}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "CountingHTTPConnectionPool",
+                (_CountingPoolMixin, HTTPConnectionPool),
+                attrs,
+            ),
+            "https": type(
+                "CountingHTTPSConnectionPool",
+                (_CountingPoolMixin, HTTPSConnectionPool),
+                attrs,
+            ),
+        }
+
+    def send(self, request, *args, **kwargs):
+        try:
+            return super().send(request, *args, **kwargs)
+        except EmptyPoolError as e:
+            raise PoolTimeout(
+                f"No free connection after {self.pool_timeout}s: the {self._pool_maxsize} "
+                "connections of the pool are in use (is a streamed response left open?)",
+                request=request,
+            ) from e
+
+
+def make_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    pool_block: bool = True,
+    pool_timeout: float | None = POOL_TIMEOUT,
+    headers: dict[str, str] | None = None,
+    verify: bool = False,
+) -> requests.Session:
+    """
+    Build a keep-alive session with a sized connection pool
+
+    Args:
+        pool_connections: number of per-host pools to cache
+        pool_maxsize: maximum number of connections kept per host
+        pool_block: wait for a free connection instead of opening extra ones
+        pool_timeout: seconds waited for a free connection before raising
+            PoolTimeout (None to wait forever)
+        headers: headers added to every request
+        verify: verify TLS certificates
+    """
+    session = requests.Session()
+    adapter = PooledAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        pool_timeout=pool_timeout,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+    session.verify = verify
+    if not verify:
+        # silenced when the first session is built rather than at import time
+        urllib3.disable_warnings(InsecureRequestWarning)
+    return session
+
+
+def pool_stats(session: requests.Session) -> dict:
+    """
+    Aggregate pool statistics over the adapters of a session
+    """
+    total = {
+        "connections_opened": 0,
+        "connections_reused": 0,
+        "requests_waiting": 0,
+        "requests_waited": 0,
+    }
+    seen = set()
+    for adapter in session.adapters.values():
+        if not isinstance(adapter, PooledAdapter) or id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        for key, value in adapter.stats.as_dict().items():
+            total[key] += value
+    return total
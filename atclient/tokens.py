@@ -0,0 +1,169 @@
+"""
+Persistent cache of access tokens shared by processes.
+
+Tokens are stored in a JSON file keyed by API url and username, next to a
+lock file taken while the cache is read or updated. A process needing a
+token reuses the cached one until shortly before its expiry (read from the
+JWT), so many workers share one login instead of each posting to /token.
+Each token is stored with a salted hash of the password it was obtained
+with, and only handed to a process logging in with the same password.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of the process are serialized
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_PATH = Path.home() / ".cache" / "atclient" / "tokens.json"
+
+# seconds before expiry a token is considered stale
+REFRESH_MARGIN = 60.0
+
+# PBKDF2 iterations of the password hashes stored with the tokens
+HASH_ITERATIONS = 100_000
+
+
+def jwt_expiry(token: str) -> float | None:
+    """Expiry timestamp of a JWT, None if it cannot be decoded."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def is_fresh(expires_at: float | None, margin: float = REFRESH_MARGIN) -> bool:
+    """Whether a token expiring at expires_at is still usable for margin seconds."""
+    return expires_at is None or time.time() < expires_at - margin
+
+
+@contextmanager
+def file_lock(path: Path, lock: threading.Lock):
+    """Hold lock, then an exclusive lock on the `.lock` file next to path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with lock:
+        fd = os.open(path.with_name(path.name + ".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+class TokenCache:
+    """
+    On-disk token cache, safe to share between threads and processes
+
+    Args:
+        path: JSON file storing the tokens (~/.cache/atclient/tokens.json by default)
+        refresh_margin: seconds before expiry a cached token is replaced
+    """
+
+    def __init__(self, path: str | Path | None = None, refresh_margin: float = REFRESH_MARGIN):
+        self.path = Path(path) if path else DEFAULT_PATH
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, username: str) -> str:
+        return f"{url.rstrip('/')}|{username}"
+
+    @staticmethod
+    def credentials_hash(key: str, password: str) -> str:
+        """Hash of a password salted with the key of its entry"""
+        return hashlib.pbkdf2_hmac(
+            "sha256", password.encode("utf-8"), key.encode("utf-8"), HASH_ITERATIONS
+        ).hex()
+
+    def _usable(self, entry: dict | None, credentials: str | None) -> bool:
+        """Whether an entry is fresh and was obtained with the same password"""
+        return bool(
+            entry
+            and is_fresh(entry.get("expires_at"), self.refresh_margin)
+            and credentials is not None
+            and hmac.compare_digest(entry.get("credentials") or "", credentials)
+        )
+
+    def _locked(self):
+        return file_lock(self.path, self._lock)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, tokens: dict) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(tokens, f)
+        os.replace(tmp, self.path)
+
+    def get(self, url: str, username: str, password: str) -> str | None:
+        """Cached token still fresh, obtained with password, or None"""
+        key = self.key(url, username)
+        credentials = self.credentials_hash(key, password)
+        with self._locked():
+            entry = self._read().get(key)
+        return entry["access_token"] if self._usable(entry, credentials) else None
+
+    def get_or_fetch(
+        self, url: str, username: str, password: str, fetch: Callable[[], str]
+    ) -> str:
+        """
+        Return the cached token obtained with the same password, or fetch
+        and store a new one
+
+        The lock is held while fetching, so concurrent processes wait for
+        the first login and then reuse its token. A wrong password never
+        gets the cached token: fetch checks it against the server.
+        """
+        key = self.key(url, username)
+        credentials = self.credentials_hash(key, password)
+        with self._locked():
+            tokens = self._read()
+            entry = tokens.get(key)
+            if self._usable(entry, credentials):
+                return entry["access_token"]
+            token = fetch()
+            tokens = {
+                k: v
+                for k, v in tokens.items()
+                if v.get("expires_at") is None or v["expires_at"] > time.time()
+            }
+            tokens[key] = {
+                "access_token": token,
+                "expires_at": jwt_expiry(token),
+                "credentials": credentials,
+            }
+            self._write(tokens)
+            return token
+
+    def invalidate(self, url: str, username: str, token: str | None = None) -> None:
+        """Remove a cached token (only if it is still token, when given)"""
+        key = self.key(url, username)
+        with self._locked():
+            tokens = self._read()
+            entry = tokens.get(key)
+            if entry is None or (token is not None and entry.get("access_token") != token):
+                return
+            del tokens[key]
+            self._write(tokens)
@@ -0,0 +1,203 @@
+"""
+Streamed multipart upload of a DataFrame.
+
+The DataFrame is serialised to CSV by chunks of rows while the request body
+is being sent, so the client never holds more than one chunk of CSV text
+in memory. Before that, minimize_frame drops the columns the server does not
+read and compacts the others.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import time
+import uuid
+import zlib
+from typing import TYPE_CHECKING, Callable, Iterator, List
+
+from .lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore[import]
+else:
+    pd = lazy_import("pandas")
+
+# rows serialised to estimate the payload of a whole DataFrame
+ESTIMATE_ROWS = 10_000
+
+
+def normalize_whitespace(values: pd.Series) -> pd.Series:
+    """Collapse runs of whitespace into one space and strip the texts."""
+    try:
+        import pyarrow as pa  # type: ignore[import]
+        import pyarrow.compute as pc  # type: ignore[import]
+
+        array = pa.array(values, type=pa.string(), from_pandas=True)
+    except Exception:
+        # without pyarrow, or for values which are not all strings
+        return values.str.replace(r"\s+", " ", regex=True).str.strip()
+    array = pc.utf8_trim_whitespace(pc.replace_substring_regex(array, r"\s+", " "))
+    return pd.Series(array.to_pandas(), index=values.index, name=values.name, dtype=values.dtype)
+
+
+def minimize_frame(
+    data: pd.DataFrame,
+    columns: List[str],
+    categorical: List[str] = [],
+    texts: List[str] = [],
+) -> pd.DataFrame:
+    """
+    Keep only the columns sent to the server and compact them
+
+    Args:
+        data: DataFrame to upload
+        columns: columns kept, in this order
+        categorical: columns converted to categories (dictionary encoded in parquet)
+        texts: text columns whose whitespace is normalised
+    """
+    frame = data[list(dict.fromkeys(columns))]
+    changed = {col: normalize_whitespace(frame[col]) for col in texts}
+    changed.update(
+        {
+            col: frame[col].astype("category")
+            for col in categorical
+            if not isinstance(frame[col].dtype, pd.CategoricalDtype)
+        }
+    )
+    return frame.assign(**changed) if changed else frame
+
+
+def estimate_payload(data: pd.DataFrame, upload_format: str = "csv", compress: bool = False) -> int:
+    """Bytes of the csv (gzipped with compress) or parquet file, from a sample of rows."""
+    sample = data.head(ESTIMATE_ROWS)
+    if not len(sample):
+        return 0
+    if upload_format == "parquet":
+        buffer = io.BytesIO()
+        sample.to_parquet(buffer, index=False, compression="zstd")
+        size = buffer.tell()
+    else:
+        payload = sample.to_csv(index=False).encode("utf-8")
+        size = len(gzip.compress(payload, compresslevel=6) if compress else payload)
+    return round(size * len(data) / len(sample))
+
+
+def format_size(n_bytes: float) -> str:
+    """Human readable size, e.g. 12.3 MB."""
+    if n_bytes < 1000:
+        return f"{n_bytes:.0f} B"
+    for unit in ("kB", "MB", "GB"):
+        n_bytes /= 1000
+        if n_bytes < 1000 or unit == "GB":
+            break
+    return f"{n_bytes:.1f} {unit}"
+
+
+class MultipartCsvStream:
+    """
+    Iterable multipart/form-data body with one CSV file field
+
+    Each iteration restarts the serialisation, so the body can be replayed.
+
+    Args:
+        data: DataFrame to send
+        filename: name of the uploaded file
+        field: name of the form field
+        chunksize: number of rows serialised at once
+        compress: gzip the CSV content (".gz" is appended to the filename)
+        progress: called after each chunk with the upload statistics
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        filename: str = "data.csv",
+        field: str = "file",
+        chunksize: int = 50_000,
+        compress: bool = False,
+        progress: Callable[[dict], None] | None = None,
+    ):
+        self.data = data
+        self.filename = f"{filename}.gz" if compress else filename
+        self.field = field
+        self.chunksize = max(1, chunksize)
+        self.compress = compress
+        self.progress = progress
+        self.boundary = uuid.uuid4().hex
+        self.bytes_sent = 0
+        self.file_bytes = 0
+        self.rows_sent = 0
+        self.elapsed = 0.0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def stats(self) -> dict:
+        """
+        Upload statistics
+
+        Returns a dict with:
+            - bytes_sent (int): body bytes handed to the connection
+            - file_bytes (int): bytes of the csv file in the body, after compression
+            - rows_sent (int): rows serialised
+            - total_rows (int): rows of the DataFrame
+            - elapsed_s (float): time since the start of the body
+            - throughput_mb_s (float): bytes_sent / elapsed in MB/s
+        """
+        return {
+            "bytes_sent": self.bytes_sent,
+            "file_bytes": self.file_bytes,
+            "rows_sent": self.rows_sent,
+            "total_rows": len(self.data),
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_mb_s": round(
+                self.bytes_sent / self.elapsed / 1e6 if self.elapsed else 0.0, 3
+            ),
+        }
+
+    def _chunks(self) -> Iterator[bytes]:
+        for start in range(0, len(self.data), self.chunksize):
+            chunk = self.data.iloc[start : start + self.chunksize]
+            yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+            self.rows_sent += len(chunk)
+        if len(self.data) == 0:
+            yield self.data.to_csv(index=False).encode("utf-8")
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.bytes_sent = 0
+        self.file_bytes = 0
+        self.rows_sent = 0
+        start = time.monotonic()
+        content_type = "application/gzip" if self.compress else "text/csv"
+        head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{self.field}"; '
+            f'filename="{self.filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+        compressor = zlib.compressobj(wbits=31) if self.compress else None
+        parts: Iterator[bytes] = self._chunks()
+        yield self._sent(head, start)
+        for part in parts:
+            if compressor is not None:
+                part = compressor.compress(part)
+                if not part:
+                    continue
+            self.file_bytes += len(part)
+            yield self._sent(part, start)
+        if compressor is not None:
+            part = compressor.flush()
+            self.file_bytes += len(part)
+            yield self._sent(part, start)
+        yield self._sent(tail, start)
+
+    def _sent(self, part: bytes, start: float) -> bytes:
+        self.bytes_sent += len(part)
+        self.elapsed = time.monotonic() - start
+        if self.progress is not None:
+            self.progress(self.stats())
+        return part
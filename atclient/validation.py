@@ -0,0 +1,190 @@
+"""
+Pre-flight validation of a new project dataset.
+
+The server only rejects a dataset once the whole file is uploaded. The checks
+here run on the DataFrame before any byte is sent: each one is a vectorised
+pass over a column (hashing for duplicates, pyarrow compute kernels for blank
+texts, type inference for labels), so they stay fast on tens of millions of
+rows. Offending rows are only gathered when a check fails.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+
+from .lazy import lazy_import
+
+if TYPE_CHECKING:
+    import numpy as np  # type: ignore[import]
+    import pandas as pd  # type: ignore[import]
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+SAMPLE_ROWS = 5
+
+# infer_dtype results mixing strings with other values in a label column
+MIXED_TYPES = ("mixed", "mixed-integer")
+
+
+class DatasetValidationError(ValueError):
+    """Raised before the upload when a dataset fails validation, with the report."""
+
+    def __init__(self, report: dict):
+        self.report = report
+        lines = [f"Dataset validation failed ({report['n_rows']} rows):"]
+        lines += [f"- {issue['message']}" for issue in report["issues"]]
+        super().__init__("\n".join(lines))
+
+
+def blank_mask(values: pd.Series) -> np.ndarray:
+    """Boolean array, True where a text value is null, empty or only whitespace."""
+    try:
+        import pyarrow as pa  # type: ignore[import]
+        import pyarrow.compute as pc  # type: ignore[import]
+    except ImportError:
+        pa = None
+    try:
+        array = pa.array(values, type=pa.string(), from_pandas=True)
+    except Exception:
+        # without pyarrow, or for values which are not all strings
+        return (values.isna() | values.astype(str).str.strip().eq("")).to_numpy(bool)
+    blank = pc.or_(pc.utf8_is_space(array), pc.equal(pc.binary_length(array), 0))
+    return blank.fill_null(True).to_numpy(zero_copy_only=False)
+
+
+def sample_rows(data: pd.DataFrame, mask: np.ndarray, columns: List[str], n: int) -> list:
+    """First n rows where mask is True, as records with their index under "row"."""
+    positions = np.flatnonzero(mask)[:n]
+    sample = data.iloc[positions][columns]
+    return [{"row": index, **row} for index, row in zip(sample.index, sample.to_dict("records"))]
+
+
+def validate_dataset(
+    data: pd.DataFrame,
+    col_id: str,
+    cols_text: List[str],
+    cols_label: List[str] = [],
+    n_train: int = 0,
+    n_test: int = 0,
+    n_valid: int = 0,
+    n_skip: int = 0,
+    n_total: int | None = None,
+    sample: int = SAMPLE_ROWS,
+) -> dict:
+    """
+    Check a dataset before the creation of a project
+
+    Args:
+        data: dataset as a Pandas DataFrame
+        col_id: column id
+        cols_text: list of text columns
+        cols_label: list of label columns
+        n_train: number of training samples
+        n_test: number of test samples
+        n_valid: number of validation samples
+        n_skip: number of samples to skip
+        n_total: total number of samples (optional)
+        sample: number of offending rows kept per issue
+
+    Returns a dict with:
+        valid: whether no issue was found
+        n_rows: number of rows of the dataset
+        issues: list of dicts with check, column, count, message and
+        sample (offending rows with their index)
+    """
+    issues = []
+
+    def add(check, column, mask, message, columns):
+        count = int(mask.sum())
+        if count:
+            issues.append(
+                {
+                    "check": check,
+                    "column": column,
+                    "count": count,
+                    "message": message.format(count=count, column=column),
+                    "sample": sample_rows(data, mask, columns, sample),
+                }
+            )
+
+    missing = [c for c in [col_id, *cols_text, *cols_label] if c not in data.columns]
+    if missing:
+        issues.append(
+            {
+                "check": "missing_columns",
+                "column": None,
+                "count": len(missing),
+                "message": f"Columns not found in data: {', '.join(missing)}",
+                "sample": [],
+            }
+        )
+        return {"valid": False, "n_rows": len(data), "issues": issues}
+
+    # ids: null, then duplicated (every occurrence is reported)
+    ids = data[col_id]
+    null_ids = ids.isna().to_numpy(bool)
+    add("null_ids", col_id, null_ids, "{count} rows without {column}", [col_id])
+    duplicated = ids.duplicated(keep=False).to_numpy(bool) & ~null_ids
+    add("duplicate_ids", col_id, duplicated, "{count} rows share their {column}", [col_id])
+
+    # texts: a row is empty when all its text columns are blank
+    if cols_text:
+        empty = np.logical_and.reduce([blank_mask(data[c]) for c in cols_text])
+        add(
+            "empty_texts",
+            ", ".join(cols_text),
+            empty,
+            "{count} rows with a null or empty text in {column}",
+            [col_id, *cols_text],
+        )
+
+    # labels: values of a single type, nulls apart
+    for col in cols_label:
+        labels = data[col]
+        if pd.api.types.infer_dtype(labels, skipna=True) not in MIXED_TYPES:
+            continue
+        # strings against the other values, whichever are fewer are reported
+        notna = labels.notna().to_numpy(bool)
+        kinds = np.frompyfunc(type, 1, 1)(labels.to_numpy(object))
+        is_str = (kinds == str) & notna
+        strings = 2 * int(is_str.sum()) >= int(notna.sum())
+        types = ", ".join(sorted(k.__name__ for k in pd.unique(kinds[notna])))
+        add(
+            "mixed_labels",
+            col,
+            notna & ~is_str if strings else is_str,
+            f"{{column}} mixes {types}: {{count}} rows are "
+            + ("not strings" if strings else "strings"),
+            [col_id, col],
+        )
+
+    # sizes of the splits
+    sizes = {"n_train": n_train, "n_test": n_test, "n_valid": n_valid, "n_skip": n_skip}
+    negative = [f"{k}={v}" for k, v in sizes.items() if v < 0]
+    available = len(data) - max(n_skip, 0)
+    if n_total is not None:
+        available = min(available, n_total)
+    requested = n_train + n_test + n_valid
+    if negative:
+        message = f"Negative sizes: {', '.join(negative)}"
+    elif requested > available:
+        message = (
+            f"n_train + n_test + n_valid = {requested} exceeds the {available} rows available"
+        )
+    else:
+        message = None
+    if message:
+        issues.append(
+            {"check": "sizes", "column": None, "count": 1, "message": message, "sample": []}
+        )
+
+    return {"valid": not issues, "n_rows": len(data), "issues": issues}
+
+
+def check_dataset(data: pd.DataFrame, **kwargs) -> dict:
+    """Validate a dataset, raise DatasetValidationError if an issue is found."""
+    report = validate_dataset(data, **kwargs)
+    if not report["valid"]:
+        raise DatasetValidationError(report)
+    return report
@@ -0,0 +1,216 @@
+"""
+Change feed over the state of projects.
+
+A Watcher polls the state of a set of projects in a background thread and
+emits typed events from the structural difference between two successive
+snapshots. Snapshots are compared by hash first, so an unchanged state is
+never diffed.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+SCHEME_ADDED = "scheme_added"
+SCHEME_REMOVED = "scheme_removed"
+LABEL_ADDED = "label_added"
+LABEL_REMOVED = "label_removed"
+TRAINING_STARTED = "training_started"
+TRAINING_FINISHED = "training_finished"
+MODEL_AVAILABLE = "model_available"
+MODEL_REMOVED = "model_removed"
+LAST_ACTIVITY_CHANGED = "last_activity_changed"
+
+
+@dataclass(frozen=True)
+class ProjectEvent:
+    """
+    Change detected on a project
+
+    kind is one of the event constants of this module, name the scheme,
+    label, model or training concerned.
+    """
+
+    kind: str
+    project_slug: str
+    name: str | None = None
+    detail: dict = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+def state_hash(state: dict) -> str:
+    return hashlib.sha1(
+        json.dumps(state, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _names(value) -> set[str]:
+    if isinstance(value, dict):
+        return {str(k) for k in value}
+    if isinstance(value, (list, tuple, set)):
+        return {str(v) for v in value if not isinstance(v, (dict, list))}
+    return set()
+
+
+def _schemes(state: dict) -> dict[str, set[str]]:
+    """Scheme name -> labels"""
+    available = state.get("schemes", {}).get("available", {})
+    if isinstance(available, dict):
+        return {
+            str(name): set(map(str, scheme.get("labels", [])))
+            if isinstance(scheme, dict)
+            else set()
+            for name, scheme in available.items()
+        }
+    return {name: set() for name in _names(available)}
+
+
+def _models(state: dict, key: str, flatten: bool = True) -> set[str]:
+    """Names in bertmodels[key], nested ones flattened as scheme/model"""
+    value = state.get("bertmodels", {}).get(key, {})
+    if not isinstance(value, dict) or not flatten:
+        return _names(value)
+    names = set()
+    for k, v in value.items():
+        inner = _names(v) if isinstance(v, (dict, list)) else set()
+        names |= {f"{k}/{m}" for m in inner} if inner else {str(k)}
+    return names
+
+
+def diff_states(project_slug: str, old: dict, new: dict) -> list[ProjectEvent]:
+    """
+    Events between two snapshots of the state of a project
+    """
+    events = []
+
+    def emit(kind, name=None, **detail):
+        events.append(ProjectEvent(kind, project_slug, name, detail))
+
+    old_schemes, new_schemes = _schemes(old), _schemes(new)
+    for scheme in sorted(new_schemes.keys() - old_schemes.keys()):
+        emit(SCHEME_ADDED, scheme, labels=sorted(new_schemes[scheme]))
+    for scheme in sorted(old_schemes.keys() - new_schemes.keys()):
+        emit(SCHEME_REMOVED, scheme)
+    for scheme in sorted(new_schemes.keys() & old_schemes.keys()):
+        for label in sorted(new_schemes[scheme] - old_schemes[scheme]):
+            emit(LABEL_ADDED, label, scheme=scheme)
+        for label in sorted(old_schemes[scheme] - new_schemes[scheme]):
+            emit(LABEL_REMOVED, label, scheme=scheme)
+
+    old_training, new_training = (
+        _models(old, "training", flatten=False),
+        _models(new, "training", flatten=False),
+    )
+    for name in sorted(new_training - old_training):
+        emit(TRAINING_STARTED, name)
+    for name in sorted(old_training - new_training):
+        emit(TRAINING_FINISHED, name)
+
+    old_models, new_models = _models(old, "available"), _models(new, "available")
+    for name in sorted(new_models - old_models):
+        emit(MODEL_AVAILABLE, name)
+    for name in sorted(old_models - new_models):
+        emit(MODEL_REMOVED, name)
+    return events
+
+
+class Watcher:
+    """
+    Background poller emitting ProjectEvent to a callback
+
+    Args:
+        api: Authenticated AtApi instance
+        project_slugs: projects to watch
+        callback: called with each event, from the watcher thread
+        interval: seconds between two polls
+    """
+
+    def __init__(
+        self,
+        api,
+        project_slugs: Iterable[str],
+        callback: Callable[[ProjectEvent], None],
+        interval: float = 5.0,
+    ):
+        self.api = api
+        self.project_slugs = list(project_slugs)
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._states: dict[str, dict] = {}
+        self._hashes: dict[str, str] = {}
+        self._activity: dict[str, str | None] = {}
+
+    def start(self) -> "Watcher":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            start = time.monotonic()
+            for event in self.poll():
+                try:
+                    self.callback(event)
+                except Exception as e:
+                    print(f"Error in watch callback: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - start)))
+
+    def poll(self) -> list[ProjectEvent]:
+        """
+        Take one snapshot of the watched projects and return the events
+
+        The first snapshot of a project only sets the baseline.
+        """
+        events: list[ProjectEvent] = []
+        try:
+            self.api.cache.invalidate(("projects",))
+            activity = {
+                p["parameters"]["project_slug"]: p.get("last_activity")
+                for p in self.api.get_projects()
+            }
+        except Exception:
+            activity = {}
+        for slug in self.project_slugs:
+            if slug in activity:
+                if slug in self._activity and self._activity[slug] != activity[slug]:
+                    events.append(
+                        ProjectEvent(
+                            LAST_ACTIVITY_CHANGED,
+                            slug,
+                            detail={
+                                "previous": self._activity[slug],
+                                "last_activity": activity[slug],
+                            },
+                        )
+                    )
+                self._activity[slug] = activity[slug]
+            try:
+                self.api.cache.invalidate(("state", slug))
+                state = self.api.get_project_state(slug)
+            except Exception:
+                continue
+            digest = state_hash(state)
+            if self._hashes.get(slug) == digest:
+                continue
+            if slug in self._states:
+                events.extend(diff_states(slug, self._states[slug], state))
+            self._states[slug] = state
+            self._hashes[slug] = digest
+        return events
@@ -0,0 +1,710 @@
+"""
+Local stand-in for the ActiveTigger API, with latency and fault injection.
+Covers the endpoints used by AtApi with an in-memory state and synthetic
+payloads, so the client can be benchmarked offline and reproducibly.
+
+Usage: python standin_server.py [--port P] [--latency DIST] [--error-rate E]
+         [--bandwidth MB] [--export-rows N] [--raw-size BYTES] [--config FILE]
+         [--write-config PATH]
+  P: port to listen on (default: 5050)
+  DIST: latency distribution in ms, e.g. fixed:5, uniform:2,20, normal:20,5,
+        lognormal:20,0.5 (median, sigma), exponential:10 (default: fixed:0)
+  E: probability of answering an injected error (default: 0)
+  MB: bandwidth cap of request and response bodies in MB/s (default: none)
+  N: rows of the annotation exports (default: 1000)
+  BYTES: size of the raw dataset file (default: 10000000)
+  FILE: YAML file with the same options, and per-endpoint overrides under
+        `endpoints` (e.g. {"/export/data": {"latency": "normal:200,50"}},
+        templates such as /projects/{slug})
+  PATH: write a client config.yaml pointing to the server
+
+Credentials: root / password (--username, --password to change them).
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import math
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import yaml  # type: ignore[import]
+
+DEFAULTS = {
+    "latency": "fixed:0",
+    "error_rate": 0.0,
+    "error_status": 503,
+    "bandwidth": None,  # MB/s
+    "export_rows": 1000,
+    "text_size": 200,
+    "feature_dim": 64,
+    "raw_size": 10_000_000,
+    "creation_delay": 0.5,  # seconds before a new project is listed
+    "training_time": 30.0,  # seconds before a training turns into a model
+    "token_ttl": 3600,
+    "username": "root",
+    "password": "password",
+    "seed": 0,
+    "endpoints": {},
+}
+
+LABELS = ["positive", "negative", "neutral"]
+CHUNK = 64 << 10
+
+
+def parse_latency(spec):
+    """Return a sampler of latencies in seconds from "kind:args" (ms)."""
+    kind, _, args = str(spec).partition(":")
+    values = [float(v) for v in args.split(",") if v] or [0.0]
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal":
+        mu = math.log(max(values[0], 1e-9))
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    if kind == "exponential":
+        return lambda rng: rng.expovariate(1 / values[0]) / 1000 if values[0] else 0.0
+    raise ValueError(f"Unknown latency distribution '{spec}'")
+
+
+def make_token(username, ttl):
+    """Unsigned JWT with an expiry, enough for the client to decode."""
+
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    payload = {"sub": username, "exp": int(time.time() + ttl), "jti": random.getrandbits(64)}
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(payload)}.standin"
+
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "project"
+
+
+class StandinState:
+    """In-memory users, tokens and projects, with cached synthetic payloads."""
+
+    def __init__(self, options):
+        self.options = options
+        self.lock = threading.Lock()
+        self.tokens = {}
+        self.users = {options["username"]: {"password": options["password"], "status": "root"}}
+        self.projects = {}
+        self._payloads = {}
+
+    def payload(self, key, build):
+        """Build a synthetic payload once, then serve it from memory."""
+        with self.lock:
+            if key not in self._payloads:
+                self._payloads[key] = build()
+            return self._payloads[key]
+
+    def refresh(self):
+        """Turn finished trainings into available models."""
+        now = time.time()
+        with self.lock:
+            for project in self.projects.values():
+                for user, training in list(project["training"].items()):
+                    if now >= training["ends_at"]:
+                        del project["training"][user]
+                        scheme = project["available"].setdefault(training["scheme"], {})
+                        scheme[training["name"]] = {"base_model": training["base_model"]}
+                        project["last_activity"] = now
+
+    def visible_projects(self):
+        now = time.time()
+        return {s: p for s, p in self.projects.items() if p["ready_at"] <= now}
+
+    def state(self, project):
+        return {
+            "params": project["params"],
+            "users": {"users": sorted(project["users"])},
+            "schemes": {
+                "available": {
+                    name: {"labels": list(labels), "kind": "multiclass"}
+                    for name, labels in project["schemes"].items()
+                }
+            },
+            "features": {"available": list(project["features"])},
+            "bertmodels": {
+                "available": project["available"],
+                "training": {
+                    user: {"name": t["name"], "scheme": t["scheme"], "status": "training"}
+                    for user, t in project["training"].items()
+                },
+            },
+            "last_activity": project["last_activity"],
+        }
+
+
+def annotations_csv(rows, text_size, seed):
+    rng = random.Random(seed)
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "tigger", "annotation", "text"]
+    out = io.StringIO()
+    out.write("id,text,label\n")
+    for i in range(rows):
+        text = " ".join(rng.choice(words) for _ in range(max(1, text_size // 6)))[:text_size]
+        label = rng.choice(LABELS) if rng.random() < 0.8 else ""
+        out.write(f"{i},{text},{label}\n")
+    return out.getvalue().encode("utf-8")
+
+
+def features_payload(rows, dim, fmt, seed):
+    import numpy as np  # type: ignore[import]
+    import pandas as pd  # type: ignore[import]
+
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(
+        rng.standard_normal((rows, dim), dtype=np.float32),
+        columns=[f"sbert__{i}" for i in range(dim)],
+    )
+    data.insert(0, "id", [str(i) for i in range(rows)])
+    if fmt == "csv":
+        return data.to_csv(index=False).encode("utf-8")
+    import pyarrow as pa  # type: ignore[import]
+
+    buffer = io.BytesIO()
+    if fmt == "parquet":
+        data.to_parquet(buffer, index=False)
+    else:
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        with pa.ipc.new_file(buffer, table.schema) as writer:
+            writer.write_table(table)
+    return buffer.getvalue()
+
+
+def raw_file(size, seed):
+    block = annotations_csv(2000, 200, seed)
+    return (block * (size // len(block) + 1))[:size]
+
+
+# (method, endpoint template, handler name), templates as in AtApi
+ROUTES = [
+    ("GET", "/", "root"),
+    ("POST", "/token", "token"),
+    ("GET", "/projects", "projects"),
+    ("POST", "/projects/new", "project_new"),
+    ("POST", "/projects/delete", "project_delete"),
+    ("GET", "/projects/{slug}", "project_state"),
+    ("POST", "/files/add/project", "upload"),
+    ("GET", "/users", "users"),
+    ("POST", "/users/create", "user_create"),
+    ("POST", "/users/delete", "user_delete"),
+    ("POST", "/users/auth/add", "auth_add"),
+    ("POST", "/users/auth/delete", "auth_delete"),
+    ("GET", "/export/data", "export_data"),
+    ("GET", "/export/features", "export_features"),
+    ("GET", "/export/raw", "export_raw"),
+    ("GET", "/static/{name}", "static"),
+    ("GET", "/features/available", "features"),
+    ("POST", "/features/add", "feature_add"),
+    ("POST", "/schemes/add", "scheme_add"),
+    ("POST", "/schemes/delete", "scheme_delete"),
+    ("POST", "/schemes/label/add", "label_add"),
+    ("POST", "/schemes/label/delete", "label_delete"),
+    ("POST", "/models/bert/train", "train"),
+    ("POST", "/stop", "stop"),
+]
+ROUTES = [
+    (method, template, re.compile(re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", template) + "$"), name)
+    for method, template, name in ROUTES
+]
+PUBLIC = {"root", "token", "static"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ActiveTiggerStandin/0.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def setup(self):
+        super().setup()
+        # headers and body are written separately: do not wait for delayed ACKs
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        try:
+            super().handle()
+        except (ConnectionResetError, BrokenPipeError):
+            pass  # client went away, e.g. a cancelled download
+
+    # --- transport: bandwidth-capped body reading and writing -------------
+
+    def _throttle(self, sent, start):
+        bandwidth = self.server.option(self.endpoint, "bandwidth")
+        if bandwidth:
+            delay = start + sent / (float(bandwidth) * 1e6) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def read_body(self):
+        start = time.monotonic()
+        chunks, size = [], 0
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                length = int(self.rfile.readline().split(b";")[0].strip() or 0, 16)
+                if length == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(length))
+                self.rfile.readline()
+                size += length
+                self._throttle(size, start)
+        else:
+            remaining = int(self.headers.get("Content-Length", 0))
+            while remaining > 0:
+                chunk = self.rfile.read(min(CHUNK, remaining))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+                size += len(chunk)
+                self._throttle(size, start)
+        return b"".join(chunks)
+
+    def send_body(self, body, status=200, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        start = time.monotonic()
+        view = memoryview(body)
+        for offset in range(0, len(body), CHUNK):
+            self.wfile.write(view[offset : offset + CHUNK])
+            self._throttle(offset + CHUNK, start)
+
+    def send_json(self, data, status=200):
+        self.send_body(json.dumps(data).encode("utf-8"), status)
+
+    # --- dispatch -----------------------------------------------------------
+
+    def do_GET(self):
+        self.dispatch()
+
+    def do_HEAD(self):
+        self.dispatch()
+
+    def do_POST(self):
+        self.dispatch()
+
+    def dispatch(self):
+        split = urlsplit(self.path)
+        self.query = {k: v if len(v) > 1 else v[0] for k, v in parse_qs(split.query).items()}
+        method = "GET" if self.command == "HEAD" else self.command
+        for route_method, template, pattern, name in ROUTES:
+            match = pattern.match(split.path)
+            if match and route_method == method:
+                break
+        else:
+            self.endpoint = "unknown"
+            self.read_body()
+            return self.send_json({"detail": "Not Found"}, 404)
+        self.endpoint = template
+        body = self.read_body() if method == "POST" else b""
+        server = self.server
+        time.sleep(server.latency(self.endpoint))
+        if server.rng_random() < server.option(self.endpoint, "error_rate"):
+            status = int(server.option(self.endpoint, "error_status"))
+            headers = {"Retry-After": "1"} if status in (429, 503) else None
+            return self.send_body(
+                json.dumps({"detail": "Injected error"}).encode(), status, headers=headers
+            )
+        try:
+            if name not in PUBLIC:
+                self.user = self.authenticate()
+            getattr(self, f"route_{name}")(body, **match.groupdict())
+        except HttpError as e:
+            self.send_json({"detail": e.detail}, e.status)
+
+    def authenticate(self):
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        with self.server.state.lock:
+            entry = self.server.state.tokens.get(token)
+        if entry is None or entry["exp"] < time.time():
+            raise HttpError(401, "Could not validate credentials")
+        return entry["username"]
+
+    def json_body(self, body):
+        try:
+            return json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(422, "Invalid JSON body")
+
+    def project(self, slug=None):
+        slug = slug or self.query.get("project_slug")
+        self.server.state.refresh()
+        project = self.server.state.projects.get(slug)
+        if project is None:
+            raise HttpError(404, f"Project {slug} not found")
+        return project
+
+    # --- routes ---------------------------------------------------------------
+
+    def route_root(self, body):
+        self.send_json({"message": "ActiveTigger stand-in"})
+
+    def route_token(self, body):
+        form = {k: v[0] for k, v in parse_qs(body.decode("utf-8")).items()}
+        state = self.server.state
+        user = state.users.get(form.get("username"))
+        if user is None or user["password"] != form.get("password"):
+            raise HttpError(401, "Incorrect username or password")
+        token = make_token(form["username"], self.server.options["token_ttl"])
+        with state.lock:
+            state.tokens[token] = {
+                "username": form["username"],
+                "exp": time.time() + self.server.options["token_ttl"],
+            }
+        self.send_json({"access_token": token, "token_type": "bearer", "status": user["status"]})
+
+    def route_projects(self, body):
+        self.server.state.refresh()
+        with self.server.state.lock:
+            projects = [
+                {
+                    "project_slug": slug,
+                    "parameters": p["params"],
+                    "created_by": p["created_by"],
+                    "last_activity": p["last_activity"],
+                }
+                for slug, p in self.server.state.visible_projects().items()
+            ]
+        self.send_json({"projects": projects})
+
+    def route_upload(self, body):
+        name = self.query.get("project_name", "")
+        with self.server.state.lock:
+            self.server.uploads[name] = len(body)
+        self.send_json({"bytes": len(body)})
+
+    def route_project_new(self, body):
+        form = self.json_body(body)
+        if not form.get("project_name"):
+            raise HttpError(422, "project_name is required")
+        state = self.server.state
+        with state.lock:
+            slug = base = slugify(form["project_name"])
+            i = 1
+            while slug in state.projects:
+                slug = f"{base}-{i}"
+                i += 1
+            labels = form.get("default_scheme") or (LABELS if form.get("cols_label") else [])
+            state.projects[slug] = {
+                "params": {**form, "project_slug": slug},
+                "created_by": self.user,
+                "users": {self.user},
+                "schemes": {"default": list(labels)},
+                "features": [],
+                "training": {},
+                "available": {},
+                "last_activity": time.time(),
+                "ready_at": time.time() + self.server.options["creation_delay"],
+            }
+        self.send_json(slug)
+
+    def route_project_delete(self, body):
+        self.project()
+        with self.server.state.lock:
+            del self.server.state.projects[self.query["project_slug"]]
+        self.send_json(None)
+
+    def route_project_state(self, body, slug):
+        project = self.project(slug)
+        if project["ready_at"] > time.time():
+            raise HttpError(404, f"Project {slug} not found")
+        with self.server.state.lock:
+            state = self.server.state.state(project)
+        self.send_json(state)
+
+    def route_users(self, body):
+        with self.server.state.lock:
+            users = {u: {"status": v["status"]} for u, v in self.server.state.users.items()}
+        self.send_json(users)
+
+    def route_user_create(self, body):
+        form = self.json_body(body)
+        with self.server.state.lock:
+            if form.get("username") in self.server.state.users:
+                raise HttpError(400, "Username already exists")
+            self.server.state.users[form["username"]] = {
+                "password": form.get("password"),
+                "status": form.get("status", "manager"),
+            }
+        self.send_json(None)
+
+    def route_user_delete(self, body):
+        with self.server.state.lock:
+            if self.server.state.users.pop(self.query.get("user_to_delete"), None) is None:
+                raise HttpError(404, "User not found")
+        self.send_json(None)
+
+    def route_auth_add(self, body):
+        form = self.json_body(body)
+        project = self.project(form.get("project_slug"))
+        with self.server.state.lock:
+            if form.get("username") not in self.server.state.users:
+                raise HttpError(404, "User not found")
+            if form["username"] in project["users"]:
+                raise HttpError(400, "User already has access to the project")
+            project["users"].add(form["username"])
+        self.send_json(None)
+
+    def route_auth_delete(self, body):
+        form = self.json_body(body)
+        project = self.project(form.get("project_slug"))
+        with self.server.state.lock:
+            project["users"].discard(form.get("username"))
+        self.send_json(None)
+
+    def route_export_data(self, body):
+        project = self.project()
+        if self.query.get("scheme") not in project["schemes"]:
+            raise HttpError(404, "Scheme not found")
+        options = self.server.options
+        payload = self.server.state.payload(
+            ("data", project["params"]["project_slug"], self.query.get("dataset")),
+            lambda: annotations_csv(
+                options["export_rows"], options["text_size"], options["seed"]
+            ),
+        )
+        self.send_body(payload, content_type="text/csv")
+
+    def route_export_features(self, body):
+        self.project()
+        fmt = self.query.get("format", "csv")
+        if fmt not in ("csv", "parquet", "arrow"):
+            raise HttpError(422, f"Unknown format {fmt}")
+        options = self.server.options
+        payload = self.server.state.payload(
+            ("features", fmt),
+            lambda: features_payload(
+                options["export_rows"], options["feature_dim"], fmt, options["seed"]
+            ),
+        )
+        self.send_body(payload, content_type="application/octet-stream")
+
+    def route_export_raw(self, body):
+        slug = self.project()["params"]["project_slug"]
+        self.send_json({"name": f"{slug}.csv", "path": f"static/{slug}.csv"})
+
+    def route_static(self, body, name):
+        options = self.server.options
+        payload = self.server.state.payload(
+            ("raw",), lambda: raw_file(options["raw_size"], options["seed"])
+        )
+        etag = f'"{hashlib.sha1(payload[:4096]).hexdigest()}-{len(payload)}"'
+        headers = {"Accept-Ranges": "bytes", "ETag": etag}
+        match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(payload) - 1), len(payload) - 1)
+            if start >= len(payload):
+                raise HttpError(416, "Range not satisfiable")
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(payload)}"
+            return self.send_body(payload[start : end + 1], 206, "text/csv", headers)
+        self.send_body(payload, 200, "text/csv", headers)
+
+    def route_features(self, body):
+        self.send_json(self.project()["features"])
+
+    def route_feature_add(self, body):
+        project = self.project()
+        form = self.json_body(body)
+        with self.server.state.lock:
+            project["features"].append(form.get("name"))
+            project["last_activity"] = time.time()
+        self.send_json(None)
+
+    def route_scheme_add(self, body):
+        project = self.project()
+        form = self.json_body(body)
+        with self.server.state.lock:
+            if form.get("name") in project["schemes"]:
+                raise HttpError(400, "Scheme already exists")
+            project["schemes"][form["name"]] = list(form.get("labels") or [])
+            project["last_activity"] = time.time()
+        self.send_json(None)
+
+    def route_scheme_delete(self, body):
+        project = self.project()
+        form = self.json_body(body)
+        with self.server.state.lock:
+            project["schemes"].pop(form.get("name"), None)
+            project["last_activity"] = time.time()
+        self.send_json(None)
+
+    def route_label_add(self, body):
+        project = self.project()
+        with self.server.state.lock:
+            labels = project["schemes"].get(self.query.get("scheme"))
+            if labels is None:
+                raise HttpError(404, "Scheme not found")
+            if self.query.get("label") not in labels:
+                labels.append(self.query.get("label"))
+            project["last_activity"] = time.time()
+        self.send_json(None)
+
+    def route_label_delete(self, body):
+        project = self.project()
+        with self.server.state.lock:
+            labels = project["schemes"].get(self.query.get("scheme"), [])
+            if self.query.get("label") in labels:
+                labels.remove(self.query.get("label"))
+            project["last_activity"] = time.time()
+        self.send_json(None)
+
+    def route_train(self, body):
+        project = self.project()
+        form = self.json_body(body)
+        with self.server.state.lock:
+            if self.user in project["training"]:
+                raise HttpError(400, "A model is already training for this user")
+            if form.get("scheme") not in project["schemes"]:
+                raise HttpError(404, "Scheme not found")
+            project["training"][self.user] = {
+                "name": form.get("name"),
+                "scheme": form.get("scheme"),
+                "base_model": form.get("base_model"),
+                "ends_at": time.time() + self.server.options["training_time"],
+            }
+            project["last_activity"] = time.time()
+        self.send_json(None)
+
+    def route_stop(self, body):
+        project = self.project()
+        with self.server.state.lock:
+            project["training"].pop(self.user, None)
+            project["last_activity"] = time.time()
+        self.send_json(None)
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    Threaded stand-in server
+
+    Options are the keys of DEFAULTS; `endpoints` maps an endpoint template
+    to overrides of latency, error_rate, error_status and bandwidth.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address=("127.0.0.1", 0), verbose=False, **options):
+        unknown = set(options) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown options: {sorted(unknown)}")
+        self.options = {**DEFAULTS, **options}
+        self.verbose = verbose
+        self.state = StandinState(self.options)
+        self.uploads = {}
+        self._rng = random.Random(self.options["seed"])
+        self._rng_lock = threading.Lock()
+        self._samplers = {}
+        super().__init__(address, StandinHandler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def option(self, endpoint, key):
+        return self.options["endpoints"].get(endpoint, {}).get(key, self.options[key])
+
+    def rng_random(self):
+        with self._rng_lock:
+            return self._rng.random()
+
+    def latency(self, endpoint):
+        spec = self.option(endpoint, "latency")
+        if spec not in self._samplers:
+            self._samplers[spec] = parse_latency(spec)
+        with self._rng_lock:
+            return self._samplers[spec](self._rng)
+
+    def start(self):
+        """Serve in a background thread and return self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def write_config(self, path):
+        """Write a client config.yaml pointing to this server."""
+        with open(path, "w") as f:
+            yaml.safe_dump(
+                {
+                    "url": self.url,
+                    "username": self.options["username"],
+                    "password": self.options["password"],
+                },
+                f,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ActiveTigger stand-in server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=5050, help="Port (default: 5050)")
+    parser.add_argument("--config", help="YAML file of options")
+    parser.add_argument("--latency", help="Latency distribution in ms (default: fixed:0)")
+    parser.add_argument("--error-rate", type=float, help="Probability of an injected error")
+    parser.add_argument("--error-status", type=int, help="Status of the injected errors")
+    parser.add_argument("--bandwidth", type=float, help="Bandwidth cap in MB/s")
+    parser.add_argument("--export-rows", type=int, help="Rows of the exports")
+    parser.add_argument("--feature-dim", type=int, help="Columns of the feature exports")
+    parser.add_argument("--raw-size", type=int, help="Size of the raw dataset in bytes")
+    parser.add_argument("--training-time", type=float, help="Seconds a training lasts")
+    parser.add_argument("--username", help="Root username (default: root)")
+    parser.add_argument("--password", help="Root password (default: password)")
+    parser.add_argument("--seed", type=int, help="Random seed (default: 0)")
+    parser.add_argument("--write-config", help="Write a client config.yaml to this path")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    options = {}
+    if args.config:
+        with open(args.config, "r") as stream:
+            options.update(yaml.safe_load(stream) or {})
+    for key in DEFAULTS:
+        value = getattr(args, key, None)
+        if value is not None:
+            options[key] = value
+
+    server = StandinServer((args.host, args.port), verbose=args.verbose, **options)
+    if args.write_config:
+        server.write_config(args.write_config)
+        print(f"Client config written to {Path(args.write_config).resolve()}")
+    print(f"ActiveTigger stand-in listening on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """
-Test if the client can create a user, grant project access, and clean up.
+Test if the client can create a user, grant project access (one by one and
+in bulk), and clean up.
 Usage: python test_api_create_users.py
 """
 
@@ -31,6 +32,20 @@ def main():
             api.delete_auth_user_project(username, slug)
             print(f"  Revoked '{username}' access from '{slug}'.")
 
+            # Bulk grants: a re-run skips the access granted by the first run
+            pairs = [(username, slug), (api.headers["username"], slug)]
+            first = api.grant_project_access_bulk(pairs)
+            check(
+                list(first["result"]) == ["created", "skipped"],
+                "Bulk grant created the access, skipped the project creator.",
+            )
+            again = api.grant_project_access_bulk(pairs)
+            check(
+                list(again["result"]) == ["skipped", "skipped"],
+                "Re-running the bulk grant skipped the existing accesses.",
+            )
+            api.delete_auth_user_project(username, slug)
+
             check(True, "User creation and project auth lifecycle successful.")
 
 
@@ -0,0 +1,79 @@
+"""
+Benchmark the dataset fingerprint against the csv serialisation it saves, and
+check that a dataset already uploaded is reused through from_project.
+
+Usage: python test_api_dataset_registry.py [--rows N]
+  N: rows of the synthetic dataset fingerprinted (default: 5_000_000)
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np  # type: ignore[import]
+import pandas as pd  # type: ignore[import]
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from atclient.automate import (
+    check,
+    create_test_project,
+    delete_test_project,
+    load_api,
+    load_test_data,
+    wait_for_project,
+)
+from atclient.registry import fingerprint
+
+UPLOAD_ENDPOINT = "/files/add/project"
+
+
+def uploads(api):
+    """Number of dataset uploads sent by the client."""
+    series = api.metrics_snapshot()["series"]
+    return sum(s["count"] for s in series if s["endpoint"] == UPLOAD_ENDPOINT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset registry benchmark")
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Rows fingerprinted")
+    args = parser.parse_args()
+
+    n = args.rows
+    data = pd.DataFrame(
+        {
+            "id": pd.Series(np.arange(n)).astype(str),
+            "text": pd.Series(np.where(np.arange(n) % 2, "some text", "other text")),
+            "label": pd.Series(np.where(np.arange(n) % 3, "yes", "no")),
+        }
+    )
+    columns = list(data.columns)
+    start = time.monotonic()
+    fingerprint(data, columns)
+    hash_seconds = time.monotonic() - start
+    start = time.monotonic()
+    data.to_csv(index=False)
+    csv_seconds = time.monotonic() - start
+    print(f"{n:,} rows: fingerprint {hash_seconds:.2f} s, csv {csv_seconds:.2f} s")
+    check(hash_seconds < csv_seconds, "Fingerprinting is faster than serialising to csv.")
+
+    # the second project is created from the first one, without upload
+    with tempfile.TemporaryDirectory() as tmp:
+        api = load_api(dataset_registry=Path(tmp) / "datasets.json")
+        dataset = load_test_data()
+        first, second = None, None
+        try:
+            first, _ = create_test_project(api, data=dataset)
+            before = uploads(api)
+            second, _ = create_test_project(api, data=dataset, wait=False)
+            wait_for_project(api, second)
+            check(uploads(api) == before, "The second project did not upload the dataset.")
+        finally:
+            for slug in (second, first):
+                if slug:
+                    delete_test_project(api, slug)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Test the chunked annotation exports: a chunk iterator read to the end, one
+closed early and unconsumed ones dropped all release their connection, so the
+next calls of a small blocking pool still go through.
+
+Usage: python test_api_export_chunks.py [--iterators N]
+  N: unconsumed iterators dropped (default: 10)
+"""
+
+import argparse
+import gc
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from atclient.automate import check, create_test_project, delete_test_project, load_api
+
+POOL_SIZE = 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked export test")
+    parser.add_argument("--iterators", type=int, default=10, help="Iterators dropped")
+    args = parser.parse_args()
+
+    api = load_api(pool_maxsize=POOL_SIZE, pool_block=True, pool_timeout=10, cache_ttl=0)
+    slug, _ = create_test_project(api, force_label=True)
+    try:
+        scheme = list(api.get_schemes(slug))[0]
+        full = api.get_annotations_data(slug, scheme)
+        chunks = api.get_annotations_data(slug, scheme, chunksize=100)
+        rows = sum(len(chunk) for chunk in chunks)
+        check(rows == len(full), f"The chunks hold the {rows} rows of the export.")
+
+        with api.get_annotations_data(slug, scheme, chunksize=100) as chunks:
+            next(chunks)
+        check(api.pool_stats()["requests_waiting"] == 0, "A chunk iterator closed early.")
+
+        for _ in range(args.iterators):
+            api.get_annotations_data(slug, scheme, chunksize=100)
+        gc.collect()
+        projects = api.get_projects()
+        check(
+            slug in [p["parameters"]["project_slug"] for p in projects],
+            f"{args.iterators} unconsumed iterators dropped, the pool still serves requests.",
+        )
+    finally:
+        delete_test_project(api, slug)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark the cold import of the client: time and resident memory.
+Each scenario runs in a fresh interpreter, so nothing is cached in memory.
+
+Usage: python test_api_import.py [--runs N]
+  N: interpreters started per scenario (default: 10)
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from atclient.automate import check
+
+SCENARIOS = {
+    "import atclient": "import atclient",
+    "AtApi": "import atclient; atclient.AtApi",
+    "AtApi + automate": "import atclient; atclient.AtApi; atclient.automate",
+    "AtApi + pandas": "import atclient; atclient.AtApi; import pandas",
+}
+
+# runs the statement, then reports its duration and the resident memory
+PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+heavy = [m for m in ("pandas", "numpy", "yaml", "aiohttp") if m in sys.modules]
+print(json.dumps({{"seconds": seconds, "rss_mb": rss_kb / 1024, "heavy": heavy}}))
+"""
+
+
+def measure(statement, runs):
+    """Return the median seconds and peak RSS (MB) of a statement in fresh interpreters."""
+    root = str(Path(__file__).parent.parent)
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(root=root, statement=statement)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results.append(json.loads(out.stdout))
+    return (
+        statistics.median(r["seconds"] for r in results),
+        statistics.median(r["rss_mb"] for r in results),
+        results[-1]["heavy"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import benchmark")
+    parser.add_argument(
+        "--runs", type=int, default=10, help="Interpreters per scenario (default: 10)"
+    )
+    args = parser.parse_args()
+
+    print(f"{'scenario':20s} {'time':>9s} {'rss':>9s}  heavy modules loaded")
+    report = {}
+    for name, statement in SCENARIOS.items():
+        seconds, rss, heavy = measure(statement, args.runs)
+        report[name] = {"seconds": seconds, "rss_mb": rss, "heavy": heavy}
+        print(f"{name:20s} {seconds * 1000:7.0f} ms {rss:6.1f} MB  {', '.join(heavy) or '-'}")
+
+    check(
+        not report["AtApi"]["heavy"],
+        "Importing atclient.AtApi loads neither pandas, numpy, yaml nor aiohttp.",
+    )
+
+
+if __name__ == "__main__":
+    main()
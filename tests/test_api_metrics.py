@@ -0,0 +1,105 @@
+"""
+Benchmark the overhead of the request metrics of the client.
+Measures the cost of recording one request, then the latency of ping with
+metrics enabled and disabled, checks that streamed annotation exports are
+counted (read, closed early or dropped unread), and prints the metrics
+collected.
+
+Usage: python test_api_metrics.py [--calls N]
+  N: number of pings per run (default: 200)
+"""
+
+import argparse
+import gc
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from atclient.automate import check, create_test_project, delete_test_project, load_api
+from atclient.metrics import RequestMetrics
+
+EXPORT_ENDPOINT = "/export/data"
+
+
+def record_cost(n=200_000):
+    """Return the mean seconds of RequestMetrics.record."""
+    metrics = RequestMetrics()
+    endpoints = ["/", "/projects", "/projects/{project_slug}", "/export/data"]
+    start = time.perf_counter()
+    for i in range(n):
+        metrics.record(endpoints[i % 4], "GET", 200, (i % 1000) / 1000, 120, 4096, 0)
+    return (time.perf_counter() - start) / n
+
+
+def ping_latencies(api, calls):
+    """Return the client-side latencies of calls pings, in seconds."""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        api.ping()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def exports(api):
+    """Number of annotation exports and bytes received, from the metrics."""
+    series = [s for s in api.metrics_snapshot()["series"] if s["endpoint"] == EXPORT_ENDPOINT]
+    return sum(s["count"] for s in series), sum(s["response_bytes"] for s in series)
+
+
+def streamed_exports(api):
+    """Export annotations by chunks three ways, return the exports and bytes recorded."""
+    slug, _ = create_test_project(api, force_label=True)
+    try:
+        scheme = list(api.get_schemes(slug))[0]
+        before, received = exports(api)
+        for _ in api.get_annotations_data(slug, scheme, chunksize=100):
+            pass
+        with api.get_annotations_data(slug, scheme, chunksize=100) as chunks:
+            next(chunks)
+        api.get_annotations_data(slug, scheme, chunksize=100)
+        gc.collect()
+        after, received_after = exports(api)
+        return after - before, received_after - received
+    finally:
+        delete_test_project(api, slug)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request metrics overhead benchmark")
+    parser.add_argument(
+        "--calls", type=int, default=200, help="Pings per run (default: 200)"
+    )
+    args = parser.parse_args()
+
+    cost = record_cost()
+    print(f"RequestMetrics.record: {cost * 1e6:.2f} us per call")
+
+    api = load_api()
+    metrics = api.metrics
+    ping_latencies(api, 10)  # warm the connection pool
+
+    medians = {}
+    for enabled in [False, True, False, True]:
+        api.metrics = metrics if enabled else None
+        median = statistics.median(ping_latencies(api, args.calls))
+        medians.setdefault(enabled, []).append(median)
+    api.metrics = metrics
+    off, on = min(medians[False]), min(medians[True])
+    print(f"ping median without metrics: {off * 1000:.3f} ms")
+    print(f"ping median with metrics:    {on * 1000:.3f} ms")
+    print(f"overhead: {(on - off) * 1e6:.1f} us per call\n")
+
+    counted, received = streamed_exports(api)
+    print(f"streamed exports recorded: {counted}, {received} bytes received\n")
+    print(api.metrics_prometheus())
+
+    check(cost < 50e-6, "Recording a request costs less than 50 us.")
+    check(counted == 3, "Streamed exports are recorded, read, closed early or dropped.")
+    check(received > 0, "The bytes of the streamed exports are recorded.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,101 +1,312 @@
 """
-Continuous API monitor — pings every ~1s, shows a live terminal chart.
-Usage: python tests/test_api_monitor.py
+Continuous API monitor — probes several endpoints every ~1s, shows a live terminal chart.
+Usage: python tests/test_api_monitor.py [--interval S] [--project SLUG] [--log FILE]
+  S: seconds between probes (default: 1)
+  SLUG: project whose state is probed (default: the first project listed)
+  FILE: rotating JSON lines log of the samples (default: monitor.log)
 Stop with Ctrl+C to see summary stats.
+
+Memory and per-tick work are constant: the chart reads a fixed-size ring
+buffer, and the percentiles come from streaming P² quantile sketches.
 """
 
-import os
+import argparse
+import json
+import logging
+import logging.handlers
+import math
 import shutil
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import yaml  # type: ignore[import]
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from atclient.automate import load_api
+from atclient.automate import DEFAULT_CONFIG, load_api
+from atclient.retry import CircuitBreaker, RetryPolicy
+
+INTERVAL = 1.0  # seconds between probes
+HISTORY = 1024  # samples kept for the chart
+BAR_CHAR = "█"  # full block character
+
+# ANSI sequences: cursor home, clear to end of line / of screen, hide/show cursor
+HOME, CLEAR_LINE, CLEAR_BELOW = "\x1b[H", "\x1b[K", "\x1b[J"
+HIDE_CURSOR, SHOW_CURSOR = "\x1b[?25l", "\x1b[?25h"
+
+
+class RingBuffer:
+    """Keep the last capacity items appended."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._next = 0
+        self._size = 0
+
+    def append(self, item):
+        self._items[self._next] = item
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def last(self, n):
+        """Return the n most recent items, oldest first."""
+        n = min(n, self._size)
+        return [self._items[(self._next - n + i) % self.capacity] for i in range(n)]
+
+    def __len__(self):
+        return self._size
+
+
+class P2Quantile:
+    """Streaming estimate of a quantile in constant memory (P² algorithm)."""
+
+    def __init__(self, q):
+        self.q = q
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x):
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(x)
+            heights.sort()
+            return
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if heights[i] <= x < heights[i + 1])
+        for i in range(k + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        for i in (1, 2, 3):
+            d = self.desired[i] - self.positions[i]
+            if (d >= 1 and self.positions[i + 1] - self.positions[i] > 1) or (
+                d <= -1 and self.positions[i - 1] - self.positions[i] < -1
+            ):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, d)
+                heights[i] = height
+                self.positions[i] += d
+
+    def _parabolic(self, i, d):
+        n, h = self.positions, self.heights
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, d):
+        n, h = self.positions, self.heights
+        return h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+    def value(self):
+        if not self.heights:
+            return math.nan
+        if len(self.heights) < 5:
+            ordered = sorted(self.heights)
+            return ordered[min(len(ordered) - 1, int(self.q * len(ordered)))]
+        return self.heights[2]
+
+
+class EndpointStats:
+    """Running count, errors, min, max, mean and p50/p95/p99 of one endpoint."""
 
-INTERVAL = 1.0  # seconds between pings
-BAR_CHAR = "\u2588"  # full block character
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.last = None
+        self.quantiles = {q: P2Quantile(q) for q in (0.5, 0.95, 0.99)}
 
+    def add(self, ms):
+        self.count += 1
+        self.last = ms
+        if ms is None:
+            self.errors += 1
+            return
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+        for sketch in self.quantiles.values():
+            sketch.add(ms)
 
-def render(results, term_width, term_height):
+    def row(self):
+        ok = self.count - self.errors
+        if not ok:
+            return f"{'--':>7} {'--':>7} {'--':>7} {'--':>7} {'--':>7} {'--':>7}"
+        values = [
+            self.last if self.last is not None else math.nan,
+            self.total / ok,
+            self.quantiles[0.5].value(),
+            self.quantiles[0.95].value(),
+            self.quantiles[0.99].value(),
+            self.max,
+        ]
+        return " ".join(f"{v:7.0f}" for v in values)
+
+
+def make_probes(api, username, password, project_slug):
+    """Return {name: callable returning the latency in ms, None on failure}."""
+
+    def timed(call, *args):
+        def probe():
+            start = time.perf_counter()
+            try:
+                call(*args)
+            except Exception:
+                return None
+            return (time.perf_counter() - start) * 1000
+
+        return probe
+
+    def ping():
+        if not api.ping()["available"]:
+            raise Exception("API not available")
+
+    probes = {"/": timed(ping)}
+    if username and password:
+        probes["/token"] = timed(api.fetch_token, username, password)
+    probes["/projects"] = timed(api.get_projects)
+    if project_slug:
+        probes[f"/projects/{project_slug}"] = timed(api.get_project_state, project_slug)
+    return probes
+
+
+def make_log(path, max_bytes, backups):
+    """JSON lines logger rotating at max_bytes, keeping backups files."""
+    logger = logging.getLogger("atclient.monitor")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backups
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+def render(history, stats, interval, term_width, term_height):
     """Build the terminal display string."""
-    # Reserve lines: header(2) + blank(1) + stats(1) + blank(1) = 5
-    max_rows = term_height - 5
-    visible = results[-max(max_rows, 1) :]
+    names = list(stats)
+    header = [
+        f"ActiveTigger API Monitor  (every {interval:g}s, {stats['/'].count} probes)",
+        "",
+        f"{'endpoint':30s} {'last':>7} {'avg':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  errors",
+    ]
+    for name in names:
+        s = stats[name]
+        header.append(f"{name[:30]:30s} {s.row()}  {s.errors}/{s.count}")
+    header += ["", "/ (ms)"]
 
-    times = [r["response_time_ms"] for r in results if r["available"]]
+    # Reserve lines: header + blank(1)
+    max_rows = max(term_height - len(header) - 1, 1)
+    visible = history.last(max_rows)
+    times = [sample["/"] for sample in visible if sample["/"] is not None]
     max_time = max(times) if times else 1
-    errors = sum(1 for r in results if not r["available"])
 
     # Column layout: "  123 ms |████████"
     label_width = 10  # "  123 ms "
     separator = "| "
-    bar_max = term_width - label_width - len(separator)
-    if bar_max < 1:
-        bar_max = 1
-
-    lines = []
-    lines.append(
-        f"ActiveTigger API Monitor  (every {INTERVAL:.0f}s, {len(results)} pings)"
-    )
-    lines.append("")
+    bar_max = max(term_width - label_width - len(separator), 1)
 
-    for r in visible:
-        if r["available"]:
-            ms = r["response_time_ms"]
+    lines = list(header)
+    for sample in visible:
+        ms = sample["/"]
+        if ms is not None:
             bar_len = max(1, int(ms / max_time * bar_max))
-            label = f"{ms:6.0f} ms "
-            lines.append(f"{label}{separator}{BAR_CHAR * bar_len}")
+            lines.append(f"{ms:6.0f} ms {separator}{BAR_CHAR * bar_len}")
         else:
-            label = "    -- ms "
-            lines.append(f"{label}{separator}FAIL")
-
-    lines.append("")
-    if times:
-        avg = sum(times) / len(times)
-        lines.append(
-            f"avg {avg:.0f} ms | min {min(times):.0f} ms | max {max(times):.0f} ms | errors {errors}/{len(results)}"
-        )
-    else:
-        lines.append(f"No successful pings yet | errors {errors}/{len(results)}")
+            lines.append(f"    -- ms {separator}FAIL")
+    return lines
+
 
-    return "\n".join(lines)
+def draw(lines):
+    """Redraw in place: overwrite each line, then clear what is left below."""
+    sys.stdout.write(HOME + "".join(line + CLEAR_LINE + "\n" for line in lines) + CLEAR_BELOW)
+    sys.stdout.flush()
 
 
 def main():
-    api = load_api()
-    results = []
+    parser = argparse.ArgumentParser(description="ActiveTigger API monitor")
+    parser.add_argument(
+        "--interval", type=float, default=INTERVAL, help="Seconds between probes (default: 1)"
+    )
+    parser.add_argument("--project", help="Project whose state is probed")
+    parser.add_argument("--log", default="monitor.log", help="Samples log (default: monitor.log)")
+    parser.add_argument(
+        "--log-max-bytes", type=int, default=10_000_000, help="Log size before rotation"
+    )
+    parser.add_argument("--log-backups", type=int, default=5, help="Rotated logs kept")
+    args = parser.parse_args()
+
+    # no retries, no cache and a breaker that never opens: each probe is
+    # one request, sent even during an outage to see the recovery
+    api = load_api(
+        cache_ttl=0,
+        retry=RetryPolicy(total=0),
+        circuit_breaker=CircuitBreaker(failure_threshold=math.inf),
+    )
+    with open(DEFAULT_CONFIG, "r") as stream:
+        config = yaml.safe_load(stream)
+    project_slug = args.project
+    if project_slug is None:
+        slugs = api.get_projects_slugs()
+        project_slug = slugs[0] if slugs else None
+    probes = make_probes(api, config.get("username"), config.get("password"), project_slug)
+    stats = {name: EndpointStats() for name in probes}
+    history = RingBuffer(HISTORY)
+    log = make_log(args.log, args.log_max_bytes, args.log_backups)
 
     print("Starting API monitor (Ctrl+C to stop)...")
+    sys.stdout.write(HIDE_CURSOR + HOME + CLEAR_BELOW)
+    executor = ThreadPoolExecutor(max_workers=len(probes))
     try:
         while True:
             start = time.monotonic()
-            result = api.ping()
-            results.append(result)
+            futures = {name: executor.submit(probe) for name, probe in probes.items()}
+            sample = {name: future.result() for name, future in futures.items()}
+            for name, ms in sample.items():
+                stats[name].add(ms)
+            history.append(sample)
+            log.info(json.dumps({"timestamp": time.time(), **sample}))
 
             term = shutil.get_terminal_size((80, 24))
-            output = render(results, term.columns, term.lines)
-
-            os.system("clear" if os.name != "nt" else "cls")
-            print(output)
+            draw(render(history, stats, args.interval, term.columns, term.lines))
 
             elapsed = time.monotonic() - start
-            remaining = max(0.0, INTERVAL - elapsed)
-            time.sleep(remaining)
+            time.sleep(max(0.0, args.interval - elapsed))
 
     except KeyboardInterrupt:
         pass
+    finally:
+        sys.stdout.write(SHOW_CURSOR)
+        executor.shutdown(wait=False)
 
     # Final summary
     print("\n--- Monitor Summary ---")
-    print(f"Total pings: {len(results)}")
-    times = [r["response_time_ms"] for r in results if r["available"]]
-    errors = sum(1 for r in results if not r["available"])
-    if times:
-        print(f"Avg: {sum(times) / len(times):.0f} ms")
-        print(f"Min: {min(times):.0f} ms")
-        print(f"Max: {max(times):.0f} ms")
-    print(f"Errors: {errors}/{len(results)}")
+    for name, s in stats.items():
+        ok = s.count - s.errors
+        print(f"{name}: {s.count} probes, errors {s.errors}/{s.count}")
+        if ok:
+            print(
+                f"  Avg: {s.total / ok:.0f} ms | Min: {s.min:.0f} ms | Max: {s.max:.0f} ms"
+                f" | p50: {s.quantiles[0.5].value():.0f} ms"
+                f" | p95: {s.quantiles[0.95].value():.0f} ms"
+                f" | p99: {s.quantiles[0.99].value():.0f} ms"
+            )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+Benchmark the return types of get_annotations_data: pandas, arrow, records and raw.
+Each type is fetched in a fresh interpreter, which reports the time and the
+peak resident memory of the call, so the types do not share allocations.
+
+Usage: python test_api_return_type.py [--project SLUG] [--scheme SCHEME] [--runs N]
+  SLUG: project to export (default: a test project created then deleted)
+  SCHEME: scheme to export (default: the first scheme of the project)
+  N: runs per return type, the best is kept (default: 3)
+
+For large exports offline, run it against the stand-in server:
+  python standin_server.py --export-rows 1000000 --write-config config.yaml
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from atclient.automate import check, create_test_project, delete_test_project, load_api
+
+RETURN_TYPES = ["pandas", "arrow", "records", "raw"]
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from atclient.automate import load_api
+api = load_api()
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+data = api.get_annotations_data({slug!r}, {scheme!r}, return_type={return_type!r})
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if isinstance(data, bytes):
+    rows = data.count(b"\\n") - 1
+else:
+    rows = data.num_rows if hasattr(data, "num_rows") else len(data)
+print(json.dumps({{"seconds": seconds, "peak_mb": (peak - before) / 1024, "rows": rows}}))
+"""
+
+
+def measure(slug, scheme, return_type, runs):
+    """Return the best seconds and memory growth (MB) of a return type."""
+    root = str(Path(__file__).parent.parent)
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                CHILD.format(root=root, slug=slug, scheme=scheme, return_type=return_type),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return (
+        min(r["seconds"] for r in results),
+        min(r["peak_mb"] for r in results),
+        results[-1]["rows"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Return type benchmark")
+    parser.add_argument("--project", help="Project to export")
+    parser.add_argument("--scheme", help="Scheme to export")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per type (default: 3)")
+    args = parser.parse_args()
+
+    api = load_api()
+    slug = args.project
+    created = slug is None
+    if created:
+        slug, _ = create_test_project(api, force_label=True)
+    try:
+        scheme = args.scheme or list(api.get_schemes(slug))[0]
+        print(f"Export of {slug}/{scheme}\n")
+        print(f"{'return type':12s} {'time':>9s} {'memory':>10s} {'rows':>9s}")
+        report = {}
+        for return_type in RETURN_TYPES:
+            seconds, memory, rows = measure(slug, scheme, return_type, args.runs)
+            report[return_type] = {"seconds": seconds, "memory_mb": memory, "rows": rows}
+            print(f"{return_type:12s} {seconds * 1000:7.0f} ms {memory:7.1f} MB {rows:9d}")
+    finally:
+        if created:
+            delete_test_project(api, slug)
+
+    check(
+        report["arrow"]["rows"] == report["pandas"]["rows"],
+        "Arrow and pandas results have the same number of rows.",
+    )
+
+
+if __name__ == "__main__":
+    main()
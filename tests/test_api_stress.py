@@ -5,12 +5,33 @@ Runs for T minutes then tears everything down.
 Usage: python test_api_stress.py [--users N] [--duration T]
   N: number of concurrent users (default: 5)
   T: duration in minutes (default: 10)
+
+Load mode: open-loop load test with a weighted mix of operations.
+Operations arrive at RATE per second (Poisson arrivals, whatever the response
+times), ramped up linearly during R seconds then held during S seconds.
+Reports per-operation latency percentiles, error rate and throughput as JSON.
+
+Usage: python test_api_stress.py --mode load [--rate RATE] [--ramp-up R]
+         [--steady S] [--mix MIX] [--concurrency C] [--output FILE]
+  RATE: arrivals per second in the steady phase (default: 5)
+  R: ramp-up duration in seconds (default: 30)
+  S: steady phase duration in seconds (default: 120)
+  MIX: weights of the operations (default: ping=40,state=30,export=20,create=5,train=5)
+  C: maximum number of operations in flight (default: 64)
+  FILE: also write the JSON report to this file
+
+With --reuse-uploads, projects are created from_project when the same dataset
+was already uploaded (local dataset registry), instead of uploading it again.
 """
 
 import argparse
+import json
+import math
+import random
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -22,12 +43,15 @@ from atclient.automate import (
     delete_test_user,
     load_api,
     load_test_data,
+    wait_for_project,
     wait_for_training,
 )
 from atclient.pyactivetigger import AtApi
+from atclient.retry import RetryPolicy
 
 BASE_MODEL = "camembert/camembert-base"
 USER_PASSWORD = "Stresstest1!"
+DEFAULT_MIX = "ping=40,state=30,export=20,create=5,train=5"
 
 
 def worker(admin_api, user_index, data, results, ready_event, stop_event):
@@ -46,7 +70,7 @@ def worker(admin_api, user_index, data, results, ready_event, stop_event):
         results[user_index]["username"] = username
 
         # 2. User connects with their own session
-        user_api = AtApi(url=admin_api.url)
+        user_api = AtApi(url=admin_api.url, dataset_registry=admin_api.dataset_registry)
         user_api.connect(username, USER_PASSWORD)
         if user_api.headers is None:
             raise Exception(f"{tag} User authentication failed")
@@ -54,9 +78,11 @@ def worker(admin_api, user_index, data, results, ready_event, stop_event):
 
         # 3. User creates a project with labels
         print(f"{tag} Creating project...")
-        slug, state = create_test_project(
-            user_api, data=data, force_label=True, n_train=500, n_test=50, timeout=120
+        slug, _ = create_test_project(
+            user_api, data=data, force_label=True, n_train=500, n_test=50, wait=False
         )
+        # all the workers wait on the admin poller: one project list per tick
+        wait_for_project(admin_api, slug, timeout=120)
         print(f"{tag} Project ready: {slug}")
         results[user_index]["slug"] = slug
 
@@ -76,7 +102,7 @@ def worker(admin_api, user_index, data, results, ready_event, stop_event):
 
         # 5. Verify training started
         try:
-            models = wait_for_training(user_api, slug, timeout=60)
+            models = wait_for_training(admin_api, slug, timeout=60)
             print(f"{tag} Training running: {list(models['training'].keys())}")
             results[user_index]["training_started"] = True
         except TimeoutError:
@@ -124,6 +150,202 @@ def cleanup(admin_api, results):
             print(f"{tag} Deleted user {username}")
 
 
+def parse_mix(mix):
+    """Parse "op=weight,..." into {op: weight}."""
+    weights = {}
+    for item in mix.split(","):
+        op, _, weight = item.partition("=")
+        if op.strip() not in LOAD_OPERATIONS:
+            raise ValueError(f"Unknown operation '{op}', expected one of {sorted(LOAD_OPERATIONS)}")
+        weights[op.strip()] = float(weight or 1)
+    return weights
+
+
+def op_ping(api, ctx):
+    api.ping()
+
+
+def op_state(api, ctx):
+    api.get_project_state(ctx["slug"])
+
+
+def op_export(api, ctx):
+    api.get_annotations_data(ctx["slug"], ctx["scheme"], "train")
+
+
+def op_create(api, ctx):
+    slug, _ = create_test_project(
+        api, data=ctx["data"], n_train=100, n_test=10, force_label=True, wait=False
+    )
+    if slug:
+        with ctx["lock"]:
+            ctx["created"].append(slug)
+
+
+def op_train(api, ctx):
+    api.start_finetune_model(
+        project_slug=ctx["slug"],
+        scheme=ctx["scheme"],
+        name=f"load-model-{random.getrandbits(32):08x}",
+        base_model=BASE_MODEL,
+    )
+    # stopped after being timed, so the next start is not rejected
+    return lambda: api.stop_finetune_model(ctx["slug"])
+
+
+LOAD_OPERATIONS = {
+    "ping": op_ping,
+    "state": op_state,
+    "export": op_export,
+    "create": op_create,
+    "train": op_train,
+}
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+def summarize(samples, seconds):
+    """Per-operation latency percentiles (ms), error rate and throughput."""
+    report = {}
+    for op in sorted({s["op"] for s in samples}):
+        op_samples = [s for s in samples if s["op"] == op]
+        latencies = sorted(s["latency"] * 1000 for s in op_samples)
+        errors = sum(1 for s in op_samples if s["error"])
+        report[op] = {
+            "count": len(op_samples),
+            "errors": errors,
+            "error_rate": round(errors / len(op_samples), 4),
+            "throughput_per_s": round(len(op_samples) / seconds, 3) if seconds else None,
+            "p50_ms": round(percentile(latencies, 0.50), 1),
+            "p95_ms": round(percentile(latencies, 0.95), 1),
+            "p99_ms": round(percentile(latencies, 0.99), 1),
+            "max_ms": round(latencies[-1], 1),
+        }
+    return report
+
+
+def arrival_time(intensity, rate, ramp_up):
+    """
+    Time at which the cumulated arrival intensity is reached, when the rate
+    grows linearly from 0 to rate during ramp_up seconds then stays constant.
+    Applied to a unit Poisson process, gives the arrivals of the load test.
+    """
+    ramp_intensity = rate * ramp_up / 2
+    if intensity < ramp_intensity:
+        return math.sqrt(2 * ramp_up * intensity / rate)
+    return ramp_up + (intensity - ramp_intensity) / rate
+
+
+def run_load(args):
+    """Open-loop load test, returns the JSON report."""
+    weights = parse_mix(args.mix)
+    ops, op_weights = list(weights), list(weights.values())
+
+    # no retries and no cache: every operation reaches the server once
+    api = load_api(
+        pool_maxsize=args.concurrency,
+        cache_ttl=0,
+        retry=RetryPolicy(total=0),
+        dataset_registry=args.reuse_uploads,
+    )
+    check(api.ping()["available"], "API is reachable")
+    data = load_test_data()
+    print("Creating the base project...")
+    slug, _ = create_test_project(api, data=data, n_train=500, n_test=50, force_label=True)
+    scheme = list(api.get_schemes(slug))[0]
+    ctx = {
+        "slug": slug,
+        "scheme": scheme,
+        "data": data.head(500),
+        "created": [],
+        "lock": threading.Lock(),
+    }
+
+    # an operation fails when it raises or one of its requests fails
+    local = threading.local()
+
+    def on_request(record):
+        if record.status == 0 or record.status >= 400:
+            local.failed = f"{record.method} {record.endpoint}: HTTP {record.status}"
+
+    api.metrics.add_hook(on_request)
+
+    samples = []
+    samples_lock = threading.Lock()
+
+    def execute(op, scheduled, phase):
+        local.failed = None
+        error = None
+        after = None
+        try:
+            after = LOAD_OPERATIONS[op](api, ctx)
+        except Exception as e:
+            error = str(e)
+        # latency from the scheduled arrival: includes the time queued
+        latency = time.monotonic() - scheduled
+        error = error or local.failed
+        with samples_lock:
+            samples.append({"op": op, "phase": phase, "latency": latency, "error": error})
+        if callable(after):
+            try:
+                after()
+            except Exception:
+                pass
+
+    total = args.ramp_up + args.steady
+    print(
+        f"Load: {args.rate}/s, ramp-up {args.ramp_up}s, steady {args.steady}s, mix {weights}"
+    )
+    start = time.monotonic()
+    intensity = 0.0
+    executor = ThreadPoolExecutor(max_workers=args.concurrency)
+    try:
+        while True:
+            intensity += random.expovariate(1.0)
+            elapsed = arrival_time(intensity, args.rate, args.ramp_up)
+            if elapsed >= total:
+                break
+            phase = "ramp_up" if elapsed < args.ramp_up else "steady"
+            delay = start + elapsed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            op = random.choices(ops, op_weights)[0]
+            executor.submit(execute, op, start + elapsed, phase)
+    except KeyboardInterrupt:
+        print("\nInterrupted by user.")
+    finally:
+        executor.shutdown(wait=True)
+        elapsed = time.monotonic() - start
+        print("\n--- Cleanup ---")
+        for created in [slug] + ctx["created"]:
+            delete_test_project(api, created)
+
+    steady_seconds = max(0.0, min(elapsed, total) - args.ramp_up)
+    steady = [s for s in samples if s["phase"] == "steady"]
+    report = {
+        "url": api.url,
+        "config": {
+            "rate": args.rate,
+            "ramp_up_s": args.ramp_up,
+            "steady_s": args.steady,
+            "mix": weights,
+            "concurrency": args.concurrency,
+        },
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seconds": round(elapsed, 1),
+        "operations": len(samples),
+        "steady": summarize(steady, steady_seconds),
+        "all": summarize(samples, elapsed),
+        "errors_sample": [s["error"] for s in samples if s["error"]][:10],
+    }
+    return report
+
+
 def main():
     parser = argparse.ArgumentParser(description="ActiveTigger stress benchmark")
     parser.add_argument(
@@ -132,14 +354,50 @@ def main():
     parser.add_argument(
         "--duration", type=int, default=10, help="Duration in minutes (default: 10)"
     )
+    parser.add_argument(
+        "--mode",
+        choices=["users", "load"],
+        default="users",
+        help="users: one training per user (default); load: open-loop load test",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=5.0, help="Arrivals per second (default: 5)"
+    )
+    parser.add_argument(
+        "--ramp-up", type=float, default=30.0, help="Ramp-up in seconds (default: 30)"
+    )
+    parser.add_argument(
+        "--steady", type=float, default=120.0, help="Steady phase in seconds (default: 120)"
+    )
+    parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help=f"Operation weights (default: {DEFAULT_MIX})"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=64, help="Operations in flight (default: 64)"
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument(
+        "--reuse-uploads",
+        action="store_true",
+        help="Create projects from_project when the dataset was already uploaded",
+    )
     args = parser.parse_args()
 
+    if args.mode == "load":
+        report = run_load(args)
+        content = json.dumps(report, indent=2)
+        print(content)
+        if args.output:
+            Path(args.output).write_text(content)
+        check(report["operations"] > 0, "Operations were sent during the load test.")
+        return
+
     n_users = args.users
     duration_min = args.duration
 
     print(f"=== Stress Benchmark: {n_users} users, {duration_min} min ===\n")
 
-    admin_api = load_api()
+    admin_api = load_api(dataset_registry=args.reuse_uploads)
     ping = admin_api.ping()
     check(ping["available"], "API is reachable")
     print(f"  Response time: {ping['response_time_ms']} ms\n")
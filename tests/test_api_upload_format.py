@@ -0,0 +1,125 @@
+"""
+Benchmark the upload formats of add_project: csv against parquet, with the
+upload minimized (the default of add_project) or not.
+Compares serialisation time and payload size of the frame add_project sends,
+then the bytes actually uploaded and the end-to-end project creation latency.
+
+Usage: python test_api_upload_format.py [--repeat R]
+  R: number of times the dataset is concatenated to itself (default: 1)
+"""
+
+import argparse
+import gzip
+import io
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd  # type: ignore[import]
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from atclient.automate import (
+    check,
+    delete_test_project,
+    load_api,
+    load_test_data,
+    make_project_name,
+    wait_for_project,
+)
+from atclient.upload import minimize_frame
+
+COLUMNS = ["id", "text", "label"]
+UPLOAD_ENDPOINT = "/files/add/project"
+
+
+def payload_frame(data, upload_format, minimize):
+    """Frame serialised by add_project for a format."""
+    if not minimize:
+        return data
+    categorical = ["label"] if upload_format == "parquet" else []
+    return minimize_frame(data, COLUMNS, categorical=categorical)
+
+
+def serialise(data, upload_format):
+    """Return (seconds, bytes) to build the payload of a format."""
+    start = time.monotonic()
+    if upload_format == "parquet":
+        buffer = io.BytesIO()
+        data.to_parquet(buffer, index=False, compression="zstd")
+        payload = buffer.getvalue()
+    elif upload_format == "csv.gz":
+        payload = gzip.compress(data.to_csv(index=False).encode("utf-8"), compresslevel=6)
+    else:
+        payload = data.to_csv(index=False).encode("utf-8")
+    return time.monotonic() - start, len(payload)
+
+
+def uploaded_bytes(api):
+    """Bytes of the dataset uploads sent by the client."""
+    series = api.metrics_snapshot()["series"]
+    return sum(s["request_bytes"] for s in series if s["endpoint"] == UPLOAD_ENDPOINT)
+
+
+def create(api, data, upload_format, minimize):
+    """Return the seconds from upload to project available, and the bytes uploaded."""
+    before = uploaded_bytes(api)
+    start = time.monotonic()
+    slug = api.add_project(
+        project_name=make_project_name(f"upload-{upload_format}"),
+        data=data,
+        col_id="id",
+        cols_text=["text"],
+        cols_label=["label"],
+        n_train=min(1000, len(data)),
+        upload_format="csv" if upload_format == "csv.gz" else upload_format,
+        compress=upload_format == "csv.gz",
+        minimize=minimize,
+    )
+    try:
+        wait_for_project(api, slug, timeout=300)
+        return time.monotonic() - start, uploaded_bytes(api) - before
+    finally:
+        delete_test_project(api, slug)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload format benchmark")
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Dataset size multiplier (default: 1)"
+    )
+    args = parser.parse_args()
+
+    data = load_test_data()
+    if args.repeat > 1:
+        data = pd.concat([data] * args.repeat, ignore_index=True)
+        data["id"] = range(len(data))
+    print(f"Dataset: {len(data)} rows, {len(data.columns)} columns\n")
+
+    formats = ["csv", "csv.gz", "parquet"]
+    print("Serialisation of the frame sent:")
+    for minimize in [False, True]:
+        for upload_format in formats:
+            frame = payload_frame(data, upload_format, minimize)
+            seconds, size = serialise(frame, upload_format)
+            label = f"{upload_format}{' minimized' if minimize else ''}"
+            print(f"  {label:18s} {seconds * 1000:8.0f} ms {size / 1e6:8.2f} MB")
+
+    api = load_api()
+    print("\nProject creation (upload to available):")
+    results = {}
+    for minimize in [False, True]:
+        for upload_format in formats:
+            seconds, sent = create(api, data, upload_format, minimize)
+            results[upload_format, minimize] = sent
+            label = f"{upload_format}{' minimized' if minimize else ''}"
+            print(f"  {label:18s} {seconds:8.2f} s {sent / 1e6:8.2f} MB uploaded")
+
+    check(len(results) == 2 * len(formats), "Every upload format created a project.")
+    check(
+        all(results[f, True] < results[f, False] for f in formats),
+        "Minimized uploads send fewer bytes in every format.",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark the pre-flight validation of add_project, and check that an invalid
+dataset is refused before anything is uploaded.
+
+Usage: python test_api_validation.py [--rows N]
+  N: rows of the synthetic dataset validated (default: 10_000_000)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np  # type: ignore[import]
+import pandas as pd  # type: ignore[import]
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from atclient.automate import check, load_api, load_test_data, make_project_name
+from atclient.validation import DatasetValidationError, validate_dataset
+
+
+def make_dataset(n_rows):
+    """Synthetic dataset with a duplicate id, an empty text and an int label."""
+    data = pd.DataFrame(
+        {
+            "id": pd.Series(np.arange(n_rows)).astype(str),
+            "text": pd.Series(np.where(np.arange(n_rows) % 2, "some text", "other text")),
+            "label": pd.Series(np.where(np.arange(n_rows) % 3, "yes", "no"), dtype=object),
+        }
+    )
+    data.loc[n_rows - 1, "id"] = "0"
+    data.loc[n_rows // 2, "text"] = " "
+    data.loc[n_rows // 3, "label"] = 1
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset validation benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Rows validated")
+    args = parser.parse_args()
+
+    print(f"Building a dataset of {args.rows:,} rows...")
+    data = make_dataset(args.rows)
+    start = time.monotonic()
+    report = validate_dataset(data, "id", ["text"], ["label"], n_train=1000, n_test=100)
+    seconds = time.monotonic() - start
+    print(f"Validated in {seconds:.2f} s ({args.rows / seconds / 1e6:.1f} M rows/s)")
+    for issue in report["issues"]:
+        print(f"  {issue['check']}: {issue['message']}")
+    check(
+        {i["check"] for i in report["issues"]} == {"duplicate_ids", "empty_texts", "mixed_labels"},
+        "The duplicate id, the empty text and the mixed label are reported.",
+    )
+
+    # an invalid dataset never reaches the server
+    api = load_api()
+    before = set(api.get_projects_slugs())
+    invalid = load_test_data()
+    invalid.loc[1, "id"] = invalid.loc[0, "id"]
+    try:
+        api.add_project(make_project_name("invalid"), invalid, "id", ["text"], n_train=100)
+        refused = False
+    except DatasetValidationError as e:
+        print(e)
+        refused = True
+    check(refused, "add_project raises DatasetValidationError on a duplicate id.")
+    check(set(api.get_projects_slugs()) == before, "No project was created.")
+
+
+if __name__ == "__main__":
+    main()